@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Lazy loader for the dev-plugin audio notification system.
+
+Notification hooks import AudioNotifier only once they know notifications
+are enabled, so a hook with notifications disabled exits without loading
+audio_notify.
+"""
+
+
+def import_audio_notifier():
+    """Import AudioNotifier on first use (None if unavailable)."""
+    try:
+        from audio_notify import AudioNotifier
+        return AudioNotifier
+    except ImportError:
+        return None
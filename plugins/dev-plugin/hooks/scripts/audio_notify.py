@@ -10,10 +10,41 @@ import os
 import sys
 import subprocess
 import json
+import platform
 import random
+import re
+import shlex
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 
+# PIDs of detached players not yet reaped
+_spawned_pids: List[int] = []
+
+
+def _spawn_detached(cmd: List[str]) -> None:
+    """
+    Start a fire-and-forget player process with stdout/stderr discarded.
+
+    Uses posix_spawn (vfork fast path) rather than a full fork, and reaps
+    previously spawned players that have exited to avoid zombies.
+    """
+    for pid in _spawned_pids[:]:
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0] != 0:
+                _spawned_pids.remove(pid)
+        except ChildProcessError:
+            _spawned_pids.remove(pid)
+
+    if not hasattr(os, 'posix_spawnp'):
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ]
+    _spawned_pids.append(os.posix_spawnp(cmd[0], cmd, os.environ, file_actions=file_actions))
+
 
 class TTSPlayer:
     """Text-to-speech player with creative voice profiles."""
@@ -49,6 +80,12 @@ class TTSPlayer:
         'neutral': {'voice': 'Samantha', 'rate': 180},
     }
 
+    # Parsed `say -v ?` output, reused until the macOS version changes
+    VOICE_CACHE_PATH = '~/.claude/.voice_cache.json'
+
+    # Voice name (may contain spaces, e.g. "Good News") before the locale column
+    _VOICE_LINE_RE = re.compile(r'^(.+?)\s+[a-z]{2,3}_[A-Za-z0-9]+\s+#', re.MULTILINE)
+
     def __init__(self, timeout: int = 30, rate_adjustment: int = 0):
         """
         Initialize TTS player.
@@ -62,7 +99,14 @@ class TTSPlayer:
         self.available_voices = self._get_available_voices()
 
     def _get_available_voices(self) -> List[str]:
-        """Get list of available TTS voices on the system."""
+        """Get list of available TTS voices, using the on-disk cache when valid."""
+        cache_path = Path(self.VOICE_CACHE_PATH).expanduser()
+        mac_ver = platform.mac_ver()[0]
+
+        cached = self._load_voice_cache(cache_path, mac_ver)
+        if cached is not None:
+            return cached
+
         try:
             result = subprocess.run(
                 ['say', '-v', '?'],
@@ -70,30 +114,48 @@ class TTSPlayer:
                 text=True,
                 timeout=5
             )
-            # Parse voice list (format: "VoiceName  language  # description")
-            voices = []
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    voice_name = line.split()[0]
-                    voices.append(voice_name)
-            return voices
+            # Parse voice list (format: "Voice Name  language  # description")
+            voices = self._VOICE_LINE_RE.findall(result.stdout)
         except Exception:
             return ['Samantha']  # Fallback to default voice
 
-    def speak(self, message: str, voice_profile: str = 'neutral', async_mode: bool = False) -> bool:
-        """
-        Speak message with specified voice profile.
+        if voices:
+            self._save_voice_cache(cache_path, mac_ver, voices)
+        return voices
 
-        Args:
-            message: Text to speak
-            voice_profile: Voice profile key from VOICE_PROFILES
-            async_mode: If True, don't wait for completion
+    @staticmethod
+    def _load_voice_cache(cache_path: Path, mac_ver: str) -> Optional[List[str]]:
+        """Load cached voice list if it was recorded on the same macOS version."""
+        try:
+            with open(cache_path) as f:
+                data = json.load(f)
+            if data.get('mac_ver') == mac_ver and isinstance(data.get('voices'), list):
+                return data['voices']
+        except (OSError, ValueError, AttributeError):
+            pass
+        return None
+
+    @staticmethod
+    def _save_voice_cache(cache_path: Path, mac_ver: str, voices: List[str]) -> None:
+        """Persist voice list atomically (write to temp file, then rename)."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'mac_ver': mac_ver, 'voices': voices}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Cache is best-effort
+
+    def build_command(self, message: str, voice_profile: str = 'neutral') -> Optional[List[str]]:
+        """
+        Build the `say` command for a message and voice profile.
 
         Returns:
-            True if successful, False otherwise
+            Command list, or None if there is nothing to say
         """
         if not message:
-            return False
+            return None
 
         # Get voice configuration
         profile = self.VOICE_PROFILES.get(voice_profile, self.VOICE_PROFILES['neutral'])
@@ -105,17 +167,28 @@ class TTSPlayer:
             print(f"Voice '{voice}' not available, using Samantha", file=sys.stderr)
             voice = 'Samantha'
 
-        # Build say command
-        cmd = ['say', '-v', voice, '-r', str(rate), message]
+        return ['say', '-v', voice, '-r', str(rate), message]
+
+    def speak(self, message: str, voice_profile: str = 'neutral', async_mode: bool = False) -> bool:
+        """
+        Speak message with specified voice profile.
+
+        Args:
+            message: Text to speak
+            voice_profile: Voice profile key from VOICE_PROFILES
+            async_mode: If True, don't wait for completion
+
+        Returns:
+            True if successful, False otherwise
+        """
+        cmd = self.build_command(message, voice_profile)
+        if cmd is None:
+            return False
 
         try:
             if async_mode:
                 # Fire and forget
-                subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                _spawn_detached(cmd)
                 return True
             else:
                 # Wait for completion with timeout
@@ -147,6 +220,9 @@ class SoundEffectPlayer:
 
     SYSTEM_SOUNDS_DIR = '/System/Library/Sounds'
 
+    # Audio file types picked up from the custom sound library
+    SOUND_EXTENSIONS = ('.mp3', '.wav', '.aiff', '.m4a')
+
     def __init__(self, sound_library: Optional[str] = None):
         """
         Initialize sound effect player.
@@ -155,69 +231,81 @@ class SoundEffectPlayer:
             sound_library: Path to custom sound library directory
         """
         self.sound_library = Path(sound_library).expanduser() if sound_library else None
-        self.system_sounds_dir = Path(self.SYSTEM_SOUNDS_DIR)
+        # category -> absolute path string, resolved once (missing files dropped)
+        self._system_sounds: Dict[str, str] = {}
+        for category, sound_name in self.SYSTEM_SOUNDS.items():
+            sound_path = os.path.join(self.SYSTEM_SOUNDS_DIR, sound_name)
+            if os.path.exists(sound_path):
+                self._system_sounds[category] = sound_path
 
     def _find_sounds_in_category(self, category: str) -> List[Path]:
         """Find all sound files in a category folder."""
-        sounds = []
-
         # Check custom library first
-        if self.sound_library:
-            category_dir = self.sound_library / category
-            if category_dir.exists() and category_dir.is_dir():
-                # Look for audio files (mp3, wav, aiff, m4a)
-                for ext in ['*.mp3', '*.wav', '*.aiff', '*.m4a']:
-                    sounds.extend(category_dir.glob(ext))
-
-        return sounds
-
-    def _get_system_sound(self, category: str) -> Optional[Path]:
-        """Get system sound for category."""
-        sound_name = self.SYSTEM_SOUNDS.get(category)
-        if sound_name:
-            sound_path = self.system_sounds_dir / sound_name
-            if sound_path.exists():
-                return sound_path
-        return None
+        if not self.sound_library:
+            return []
 
-    def play(self, category: str, random_choice: bool = True, async_mode: bool = True) -> bool:
+        # Single directory pass, filtering by audio extension
+        try:
+            with os.scandir(self.sound_library / category) as entries:
+                return [
+                    Path(entry.path) for entry in entries
+                    if entry.name.endswith(self.SOUND_EXTENSIONS)
+                    and entry.is_file(follow_symlinks=False)
+                ]
+        except OSError:
+            return []
+
+    def _get_system_sound(self, category: str) -> Optional[str]:
+        """Get system sound for category (None if missing)."""
+        return self._system_sounds.get(category)
+
+    def select_sound(self, category: str, random_choice: bool = True) -> Optional[str]:
         """
-        Play sound from category.
+        Pick a sound file for a category.
 
         Args:
             category: Sound category (success, error, waiting, notify)
             random_choice: If True, pick random sound from category; else first available
-            async_mode: If True, don't wait for playback to complete
 
         Returns:
-            True if sound was played, False otherwise
+            Path to the sound file, or None if none is available
         """
-        # Find custom sounds first
+        # Find custom sounds first (just scanned, so known to exist)
         sounds = self._find_sounds_in_category(category)
 
         # Select sound
-        sound_path = None
         if sounds:
-            sound_path = random.choice(sounds) if random_choice else sounds[0]
-        else:
-            # Fallback to system sound
-            sound_path = self._get_system_sound(category)
+            return str(random.choice(sounds) if random_choice else sounds[0])
 
-        if not sound_path or not sound_path.exists():
+        # Fallback to system sound (existence checked on resolve)
+        sound_path = self._get_system_sound(category)
+        if not sound_path:
             print(f"No sound found for category: {category}", file=sys.stderr)
+        return sound_path
+
+    def play(self, category: str, random_choice: bool = True, async_mode: bool = True) -> bool:
+        """
+        Play sound from category.
+
+        Args:
+            category: Sound category (success, error, waiting, notify)
+            random_choice: If True, pick random sound from category; else first available
+            async_mode: If True, don't wait for playback to complete
+
+        Returns:
+            True if sound was played, False otherwise
+        """
+        sound_path = self.select_sound(category, random_choice)
+        if sound_path is None:
             return False
 
         # Play with afplay (macOS)
-        cmd = ['afplay', str(sound_path)]
+        cmd = ['afplay', sound_path]
 
         try:
             if async_mode:
                 # Fire and forget
-                subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                _spawn_detached(cmd)
                 return True
             else:
                 # Wait for completion
@@ -380,16 +468,27 @@ class AudioNotifier:
             success = self.sound.play(sound_category)
 
         elif mode == 'tts_only':
-            success = self.tts.speak(message, voice_profile)
+            # Detached like the other modes: waiting on `say` would hold
+            # the hook for the whole announcement
+            success = self.tts.speak(message, voice_profile, async_mode=True)
 
         elif mode == 'mixed':
-            # Play sound first (quick feedback), then TTS (detailed)
-            sound_played = self.sound.play(sound_category, async_mode=True)
-            # Small delay to let sound start before TTS
-            import time
-            time.sleep(0.3)
-            tts_spoken = self.tts.speak(message, voice_profile)
-            success = sound_played or tts_spoken
+            # Play sound first (quick feedback), then TTS (detailed).
+            # Chained in one detached shell so the hook never blocks.
+            steps = []
+            sound_path = self.sound.select_sound(sound_category)
+            if sound_path:
+                steps.append(shlex.join(['afplay', sound_path]))
+            tts_cmd = self.tts.build_command(message, voice_profile)
+            if tts_cmd:
+                steps.append(shlex.join(tts_cmd))
+
+            if steps:
+                try:
+                    _spawn_detached(['/bin/sh', '-c', '; '.join(steps)])
+                    success = True
+                except Exception as e:
+                    print(f"Mixed playback error: {e}", file=sys.stderr)
 
         elif mode == 'creative':
             # Random fun sounds, no TTS
@@ -415,22 +514,32 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     if not config_file.exists():
         return {}
 
+    # YAML files skip the JSON attempt entirely
+    if config_file.suffix in ('.yaml', '.yml'):
+        return _load_yaml_config(config_file)
+
     try:
         # Try loading as JSON first
         with open(config_file) as f:
             return json.load(f)
     except json.JSONDecodeError:
         # Try YAML if available
-        try:
-            import yaml
-            with open(config_file) as f:
-                return yaml.safe_load(f) or {}
-        except ImportError:
-            print("YAML parsing not available, install pyyaml", file=sys.stderr)
-            return {}
-        except Exception as e:
-            print(f"Config load error: {e}", file=sys.stderr)
-            return {}
+        return _load_yaml_config(config_file)
+
+
+def _load_yaml_config(config_file: Path) -> Dict[str, Any]:
+    """Load a YAML config file (yaml imported only when needed)."""
+    try:
+        import yaml
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(config_file) as f:
+            return yaml.load(f, Loader=loader) or {}
+    except ImportError:
+        print("YAML parsing not available, install pyyaml", file=sys.stderr)
+        return {}
+    except Exception as e:
+        print(f"Config load error: {e}", file=sys.stderr)
+        return {}
 
 
 def main():
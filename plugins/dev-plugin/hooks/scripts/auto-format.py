@@ -17,15 +17,85 @@ Future support planned:
 - Rust (rustfmt)
 """
 
+import asyncio
+import fcntl
+import hashlib
 import json
 import os
 import subprocess
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Import shared config loader
-from config import load_config
+from config import CACHE_DIR, load_config, write_private_file
+
+# File extensions formatted with prettier
+JS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+
+PRETTIER_NOT_FOUND = "Prettier not found (install with: npm install -D prettier)"
+
+# Per-user cache of `npx prettier --version` probes:
+# {project_dir: {"package_json_mtime": int, "node_modules_bin_mtime": int,
+#                "available": bool}}
+PRETTIER_CACHE_PATH = CACHE_DIR / 'prettier.json'
+
+
+def load_prettier_cache() -> Dict[str, Dict]:
+    """Load cached prettier probe results."""
+    try:
+        with open(PRETTIER_CACHE_PATH) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_prettier_cache(cache: Dict[str, Dict]) -> None:
+    """Atomically write prettier probe results."""
+    try:
+        write_private_file(PRETTIER_CACHE_PATH, json.dumps(cache).encode())
+    except OSError:
+        pass  # Cache is best-effort
+
+
+def get_queue_path(project_dir: Path) -> Path:
+    """Path of the pending-format queue for a project (batch mode)."""
+    project_hash = hashlib.blake2b(str(project_dir).encode(), digest_size=8).hexdigest()
+    return CACHE_DIR / f'fmt-queue-{os.getuid()}-{project_hash}.txt'
+
+
+def log_worker_message(project_dir: Path, message: str) -> None:
+    """Append a batch worker result to the project's auto-format log.
+
+    The detached worker has no hook output to report through, so this log
+    is the only place batch-mode results and failures show up.
+    """
+    log_path = project_dir / '.claude' / 'observability' / 'auto-format.log'
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'a') as f:
+            f.write(f"[{datetime.now().isoformat(timespec='seconds')}] {message}\n")
+    except OSError:
+        pass
+
+
+def get_worker_lock_path(queue_path: Path) -> Path:
+    """Lock file held by a queue's batch worker for as long as it runs."""
+    return queue_path.with_suffix('.lock')
+
+
+def is_worker_running(queue_path: Path) -> bool:
+    """Check whether a live batch worker holds the queue's worker lock."""
+    with open(get_worker_lock_path(queue_path), 'a') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+    # Our probe lock is released when the file closes
+    return False
 
 
 class AutoFormatter:
@@ -34,15 +104,20 @@ class AutoFormatter:
     def __init__(self, project_dir: Path, config: Optional[Dict] = None):
         self.project_dir = project_dir
         self.config = config or {}
+        self._is_typescript_project: Optional[bool] = None
 
     def is_typescript_project(self) -> bool:
-        """Check if this is a TypeScript/JavaScript project."""
-        indicators = [
-            "tsconfig.json",
-            "package.json",
-            "jsconfig.json"
-        ]
-        return any((self.project_dir / ind).exists() for ind in indicators)
+        """Check if this is a TypeScript/JavaScript project (memoized)."""
+        if self._is_typescript_project is None:
+            indicators = [
+                "tsconfig.json",
+                "package.json",
+                "jsconfig.json"
+            ]
+            self._is_typescript_project = any(
+                os.path.exists(self.project_dir / ind) for ind in indicators
+            )
+        return self._is_typescript_project
 
     def should_format_file(self, file_path: str) -> bool:
         """Determine if file should be formatted based on extension and config."""
@@ -50,44 +125,118 @@ class AutoFormatter:
         if not self.config.get('autoformat', {}).get('enabled', True):
             return False
 
-        # Get file extension
-        ext = Path(file_path).suffix
-
         # TypeScript/JavaScript files
-        if ext in ['.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs']:
+        if file_path.endswith(JS_EXTENSIONS):
             return self.is_typescript_project()
 
         return False
 
+    def cached_prettier_command(self) -> Tuple[Optional[List[str]], bool]:
+        """
+        Resolve the command used to run prettier without spawning anything.
+
+        Prefers the project's node_modules/.bin/prettier (no npx startup).
+        Otherwise uses the cached `npx prettier --version` probe for this
+        project, which stays valid until package.json or node_modules/.bin
+        changes (`npm install` updates the latter without touching the former).
+
+        Returns:
+            Tuple of (command prefix or None if unavailable, whether the npx
+            probe still needs to run)
+        """
+        local_bin = self.project_dir / 'node_modules' / '.bin' / 'prettier'
+        if os.path.exists(local_bin):
+            return [str(local_bin)], False
+
+        entry = load_prettier_cache().get(str(self.project_dir))
+        if (entry
+                and entry.get('package_json_mtime') == self._mtime_ns('package.json')
+                and entry.get('node_modules_bin_mtime') == self._mtime_ns('node_modules/.bin')):
+            return (['npx', 'prettier'] if entry.get('available') else None), False
+
+        return ['npx', 'prettier'], True
+
+    def record_prettier_probe(self, available: bool) -> None:
+        """Cache the result of an `npx prettier --version` probe."""
+        cache = load_prettier_cache()
+        cache[str(self.project_dir)] = {
+            'package_json_mtime': self._mtime_ns('package.json'),
+            'node_modules_bin_mtime': self._mtime_ns('node_modules/.bin'),
+            'available': available
+        }
+        save_prettier_cache(cache)
+
+    def _mtime_ns(self, relative_path: str) -> int:
+        """mtime of a project path in ns (0 if missing)."""
+        try:
+            return os.stat(self.project_dir / relative_path).st_mtime_ns
+        except OSError:
+            return 0
+
+    async def _run_async(self, cmd: List[str], timeout: float) -> Tuple[int, str]:
+        """Run a command in the project dir, returning (returncode, stderr)."""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=self.project_dir,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # Timed out, or cancelled (e.g. asyncio.run tearing down the
+            # gather after a sibling failed): never leave prettier orphaned
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+            if isinstance(e, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            raise
+        return proc.returncode, stderr.decode(errors='replace')
+
+    async def prettier_async(self, file_paths: List[str], workers: int = 1) -> Tuple[bool, str]:
+        """
+        Run `prettier --write` on files, split across up to `workers` processes.
+
+        When prettier resolves through npx without a cached probe, the
+        `--version` probe runs first and gates the format; only a cached
+        positive probe skips it.
+
+        Returns:
+            Tuple of (success, error message)
+        """
+        prettier_cmd, probe_needed = self.cached_prettier_command()
+        if prettier_cmd is None:
+            return False, PRETTIER_NOT_FOUND
+
+        if probe_needed:
+            probe_returncode, _ = await self._run_async(prettier_cmd + ['--version'], 5)
+            self.record_prettier_probe(probe_returncode == 0)
+            if probe_returncode != 0:
+                return False, PRETTIER_NOT_FOUND
+
+        workers = max(1, min(workers, len(file_paths)))
+        chunks = [file_paths[i::workers] for i in range(workers)]
+        results = await asyncio.gather(*(
+            self._run_async(prettier_cmd + ['--write'] + chunk, 30 + 5 * (len(chunk) - 1))
+            for chunk in chunks
+        ))
+
+        errors = [stderr.strip() or "Unknown error" for returncode, stderr in results if returncode != 0]
+        if errors:
+            return False, f"⚠ Prettier formatting failed: {'; '.join(errors)}"
+        return True, ""
+
     def format_with_prettier(self, file_path: str) -> Tuple[bool, str]:
         """Format file using prettier."""
         try:
-            # Check if prettier is available
-            check = subprocess.run(
-                ['npx', 'prettier', '--version'],
-                cwd=self.project_dir,
-                capture_output=True,
-                timeout=5
-            )
-
-            if check.returncode != 0:
-                return False, "Prettier not found (install with: npm install -D prettier)"
-
-            # Format the file
-            result = subprocess.run(
-                ['npx', 'prettier', '--write', file_path],
-                cwd=self.project_dir,
-                capture_output=True,
-                timeout=30,
-                text=True
-            )
-
-            if result.returncode == 0:
+            success, error_msg = asyncio.run(self.prettier_async([file_path]))
+            if success:
                 return True, f"✓ Formatted {Path(file_path).name} with prettier"
-            else:
-                # Formatting failed, but don't block (exit 1, not 2)
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                return False, f"⚠ Prettier formatting failed: {error_msg}"
+            # Formatting failed, but don't block (exit 1, not 2)
+            return False, error_msg
 
         except subprocess.TimeoutExpired:
             return False, "⚠ Prettier timed out"
@@ -96,22 +245,144 @@ class AutoFormatter:
         except Exception as e:
             return False, f"⚠ Error running prettier: {str(e)}"
 
+    def enqueue_format(self, file_path: str) -> Tuple[bool, str]:
+        """
+        Queue a file for batched formatting (autoformat.batch.enabled).
+
+        Spawns a detached worker whenever no live worker holds the queue's
+        worker lock, so a worker that died leaves nothing stuck: the next
+        queued file starts a new one. The worker waits for the batch window,
+        drains the queue and runs prettier once on all queued files.
+
+        Each entry records the file's mtime: the worker skips files that
+        changed again after they were queued, rather than rewriting content
+        it never saw.
+        """
+        queue_path = get_queue_path(self.project_dir)
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return True, ""  # Nothing to format
+        try:
+            queue_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(queue_path, 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.write(f'{mtime_ns}\t{file_path}\n')
+                f.flush()
+                # Checked under the queue lock: a worker only gives up its
+                # lock under the queue lock too, after seeing the queue empty
+                start_worker = not is_worker_running(queue_path)
+        except OSError:
+            # Queue unavailable - format inline instead
+            return self.format_with_prettier(file_path)
+
+        if start_worker:
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), '--flush-queue', str(self.project_dir)],
+                cwd=self.project_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+
+        return True, f"✓ Queued {Path(file_path).name} for prettier"
+
+    def flush_queue(self) -> Tuple[bool, str]:
+        """
+        Batch worker: wait for the batch window, then format every queued
+        file in one run, until the queue stays empty.
+
+        Holds the worker lock the whole time (the kernel drops it if the
+        process dies); exits at once if another worker already holds it.
+        """
+        batch_config = self.config.get('autoformat', {}).get('batch', {})
+        queue_path = get_queue_path(self.project_dir)
+
+        try:
+            lock_file = open(get_worker_lock_path(queue_path), 'a')
+        except OSError:
+            return True, ""
+
+        with lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True, ""  # The running worker drains the queue
+
+            success, message = True, ""
+            while True:
+                time.sleep(batch_config.get('window', 0.5))
+
+                try:
+                    with open(queue_path, 'a+') as f:
+                        fcntl.flock(f, fcntl.LOCK_EX)
+                        f.seek(0)
+                        pending = f.read().splitlines()
+                        if not pending:
+                            # Release while still holding the queue lock, so
+                            # a hook queueing a file now sees no worker
+                            fcntl.flock(lock_file, fcntl.LOCK_UN)
+                            return success, message
+                        f.truncate(0)
+                except OSError:
+                    return success, message
+
+                # Deduplicate, keeping the mtime of each file's latest entry
+                queued = {}
+                for entry in pending:
+                    mtime, sep, path = entry.partition('\t')
+                    if sep and path:
+                        queued.pop(path, None)
+                        queued[path] = mtime
+
+                # Skip files that changed since they were queued: formatting
+                # them would overwrite edits the hook never saw
+                file_paths = []
+                for path, mtime in queued.items():
+                    try:
+                        if str(os.stat(path).st_mtime_ns) == mtime:
+                            file_paths.append(path)
+                    except OSError:
+                        pass
+                skipped = len(queued) - len(file_paths)
+                if skipped:
+                    log_worker_message(self.project_dir, f"Skipped {skipped} file(s) changed since queued")
+                if not file_paths:
+                    continue
+
+                try:
+                    workers = batch_config.get('workers', 1)
+                    ok, error_msg = asyncio.run(self.prettier_async(file_paths, workers))
+                    message = error_msg or f"Formatted {len(file_paths)} file(s) with prettier"
+                except Exception as e:
+                    ok, message = False, f"⚠ Error running prettier: {str(e)}"
+                log_worker_message(self.project_dir, message)
+                success = success and ok
+
     def format_file(self, file_path: str) -> Tuple[bool, str]:
         """Format a file using the appropriate formatter."""
         if not self.should_format_file(file_path):
             # Skip formatting, return success
             return True, ""
 
-        # TypeScript/JavaScript - use prettier
-        ext = Path(file_path).suffix
-        if ext in ['.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs']:
-            return self.format_with_prettier(file_path)
-
-        return True, ""
+        # TypeScript/JavaScript (the only type should_format_file accepts) - use prettier
+        return self.format_with_prettier(file_path)
 
 
 def main():
     """Main hook execution."""
+    # Detached batch worker spawned by enqueue_format
+    if len(sys.argv) == 3 and sys.argv[1] == '--flush-queue':
+        project_dir = Path(sys.argv[2])
+        try:
+            formatter = AutoFormatter(project_dir, load_config(project_dir))
+            success, _ = formatter.flush_queue()
+        except Exception as e:
+            log_worker_message(project_dir, f"⚠ Batch worker error: {str(e)}")
+            success = False
+        sys.exit(0 if success else 1)
+
     try:
         # Read hook input from stdin
         try:
@@ -121,7 +392,7 @@ def main():
             hook_input = {}
 
         # Get project directory
-        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd())
 
         # Load configuration
         config = load_config(project_dir)
@@ -144,8 +415,12 @@ def main():
         # Initialize formatter
         formatter = AutoFormatter(project_dir, config)
 
-        # Format the file
-        success, message = formatter.format_file(file_path)
+        # Format the file (or queue it when batching is enabled)
+        batch_enabled = config.get('autoformat', {}).get('batch', {}).get('enabled', False)
+        if batch_enabled and formatter.should_format_file(file_path):
+            success, message = formatter.enqueue_format(file_path)
+        else:
+            success, message = formatter.format_file(file_path)
 
         # Output result
         if message:
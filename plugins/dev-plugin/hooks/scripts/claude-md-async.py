@@ -10,89 +10,93 @@ NOTE: Async hooks don't receive stdin input, so this script finds the
 transcript file from the filesystem instead.
 """
 
-import json
 import os
-import subprocess
+import signal
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from json_codec import json_loads
+from transcript_index import INDEX_DIR, find_latest_transcript
 
-def find_latest_transcript() -> tuple[str, Path] | None:
-    """Find the most recently modified transcript file.
+# Transcript index for find_latest_transcript (main transcripts only)
+TRANSCRIPT_INDEX_PATH = INDEX_DIR / ".transcript-index.json"
 
-    Claude Code stores transcripts as *.jsonl files in ~/.claude/projects/.
-    Returns (session_id, transcript_path) or None.
-    """
-    projects_dir = Path.home() / ".claude" / "projects"
-
-    if not projects_dir.exists():
-        return None
 
-    latest_file = None
-    latest_mtime = 0
+def extract_text(content) -> str:
+    """Join the text blocks of a message content list."""
+    if not isinstance(content, list):
+        return ""
+    return "\n".join(
+        item.get("text", "")
+        for item in content
+        if isinstance(item, dict) and item.get("type") == "text"
+    )
 
-    for project_dir in projects_dir.iterdir():
-        if not project_dir.is_dir():
-            continue
 
-        # Look for all .jsonl files (main transcripts, not agent-*.jsonl)
-        for transcript_file in project_dir.glob("*.jsonl"):
-            # Skip subagent transcripts
-            if transcript_file.name.startswith("agent-"):
-                continue
+# Characters of session summary included in the skill prompt
+SUMMARY_MAX_CHARS = 2000
 
-            mtime = transcript_file.stat().st_mtime
-            if mtime > latest_mtime:
-                latest_mtime = mtime
-                latest_file = transcript_file
 
-    if latest_file:
-        # Extract session ID from the first line
+def fadvise(fd: int, advice: str) -> None:
+    """Best-effort posix_fadvise over the whole file (no-op where unsupported)."""
+    if hasattr(os, 'posix_fadvise'):
         try:
-            first_line = latest_file.read_text().split("\n")[0]
-            first_msg = json.loads(first_line)
-            session_id = first_msg.get("sessionId", latest_file.stem)
-            return (session_id, latest_file)
-        except (json.JSONDecodeError, IOError, IndexError):
-            return None
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
 
-    return None
 
+def stream_transcript(transcript_path: Path, max_summary_chars: int = SUMMARY_MAX_CHARS) -> dict:
+    """Parse transcript file and build the session summary in a single streaming pass.
 
-def parse_transcript(transcript_path: Path) -> dict:
-    """Parse transcript file and extract session data.
+    Text excerpts stop being collected once they cover max_summary_chars;
+    counts and tool calls still cover the whole transcript.
 
     Returns dict with:
-    - messages: list of messages
+    - summary: "ROLE: text" excerpts, capped at max_summary_chars
     - tool_calls: list of tool calls
     - user_messages: count of user messages
     - assistant_messages: count of assistant messages
     """
-    messages = []
+    summary_lines = []
+    summary_len = 0
     tool_calls = []
     user_count = 0
     assistant_count = 0
 
     try:
-        content = transcript_path.read_text()
-        for line in content.strip().split("\n"):
-            if not line:
-                continue
-
-            try:
-                msg = json.loads(line)
-                messages.append(msg)
+        with open(transcript_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            # Read once front to back: prefetch ahead, then drop from page cache
+            fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            for line in f:
+                if not line.strip():
+                    continue
+
+                try:
+                    msg = json_loads(line)
+                except ValueError:  # json/orjson decode errors
+                    continue
+
+                message = msg.get("message", {})
+                role = message.get("role")
+                msg_content = message.get("content", [])
 
                 # Count message types
-                role = msg.get("message", {}).get("role")
                 if role == "user":
                     user_count += 1
                 elif role == "assistant":
                     assistant_count += 1
 
+                # Keep a short text excerpt until the summary is full
+                if summary_len < max_summary_chars and role in ("user", "assistant"):
+                    text = extract_text(msg_content)
+                    if text.strip():
+                        entry = f"{role.upper()}: {text[:500]}"  # Limit length
+                        summary_lines.append(entry)
+                        summary_len += len(entry) + 2  # "\n\n" separator
+
                 # Extract tool calls
-                msg_content = msg.get("message", {}).get("content", [])
                 if isinstance(msg_content, list):
                     for item in msg_content:
                         if isinstance(item, dict) and item.get("type") == "tool_use":
@@ -100,61 +104,101 @@ def parse_transcript(transcript_path: Path) -> dict:
                                 "name": item.get("name"),
                                 "id": item.get("id"),
                             })
-            except json.JSONDecodeError:
-                continue
-    except IOError:
+            fadvise(f.fileno(), 'POSIX_FADV_DONTNEED')
+    except (IOError, UnicodeDecodeError):
         pass
 
     return {
-        "messages": messages,
+        "summary": "\n\n".join(summary_lines)[:max_summary_chars],
         "tool_calls": tool_calls,
         "user_messages": user_count,
         "assistant_messages": assistant_count,
     }
 
 
-def build_transcript_summary(session_data: dict) -> str:
-    """Build a summary of the session for the claude-md-manager skill."""
-    messages = session_data["messages"]
-    tool_calls = session_data["tool_calls"]
+# Upper bound on the background claude run (SIGALRM survives exec)
+CLAUDE_TIMEOUT_SECONDS = 300
 
-    # Build a simplified transcript with key messages
-    summary_lines = []
 
-    for msg in messages:
-        role = msg.get("message", {}).get("role")
-        content = msg.get("message", {}).get("content", [])
-
-        if role == "user":
-            # Extract user text
-            text_parts = []
-            if isinstance(content, list):
-                for item in content:
-                    if isinstance(item, dict) and item.get("type") == "text":
-                        text_parts.append(item.get("text", ""))
-            user_text = "\n".join(text_parts)
-            if user_text.strip():
-                summary_lines.append(f"USER: {user_text[:500]}")  # Limit length
-
-        elif role == "assistant":
-            # Extract assistant text (skip tool results)
-            text_parts = []
-            if isinstance(content, list):
-                for item in content:
-                    if isinstance(item, dict) and item.get("type") == "text":
-                        text_parts.append(item.get("text", ""))
-            assistant_text = "\n".join(text_parts)
-            if assistant_text.strip():
-                summary_lines.append(f"ASSISTANT: {assistant_text[:500]}")  # Limit length
-
-    return "\n\n".join(summary_lines)
+def feed_stdin(data: str) -> None:
+    """Replace stdin with a pipe fed by a detached writer process.
+
+    The writer is double-forked so it is reparented to init and never
+    lingers as a zombie under the exec'd program.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Intermediate child: fork the writer and exit straight away
+        try:
+            os.close(read_fd)
+            if os.fork() == 0:
+                try:
+                    with os.fdopen(write_fd, 'w') as pipe:
+                        pipe.write(data)
+                finally:
+                    os._exit(0)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    os.dup2(read_fd, 0)
+    os.close(read_fd)
+
+
+def run_claude(prompt: str, project_dir: Path, log) -> None:
+    """Run claude with its output going to the log, then log how it ended.
+
+    A forked child execs claude directly (its stdio and cwd are set up in
+    the child only); this process just waits, kills claude's process group
+    on timeout and writes the completion footer with the exit code.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            # Own process group, so a timeout also stops claude's children
+            os.setpgid(0, 0)
+            feed_stdin(prompt)
+            os.dup2(log.fileno(), 1)
+            os.dup2(log.fileno(), 2)
+            os.chdir(project_dir)
+            os.execvp('claude', ['claude', '--plugin-dir', f'{project_dir}/plugins/dev-plugin', '--dangerously-skip-permissions'])
+        except BaseException as e:
+            os.write(2, f"\n[ERROR] Failed to start claude: {e}\n".encode())
+        finally:
+            os._exit(127)
+
+    timed_out = False
+
+    def on_timeout(signum, frame):
+        nonlocal timed_out
+        timed_out = True
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    signal.signal(signal.SIGALRM, on_timeout)
+    signal.alarm(CLAUDE_TIMEOUT_SECONDS)
+    _, status = os.waitpid(pid, 0)
+    signal.alarm(0)
+
+    # Log completion
+    log.write("---\n")
+    if timed_out:
+        log.write(f"[{datetime.now()}] Timed out after {CLAUDE_TIMEOUT_SECONDS}s\n")
+    log.write(
+        f"[{datetime.now()}] Async CLAUDE.md analysis complete\n"
+        f"Exit code: {os.waitstatus_to_exitcode(status)}\n"
+    )
 
 
 def main():
     """Invoke claude-md-manager skill to handle CLAUDE.md."""
 
     # Get project directory
-    project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+    project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd())
 
     # Setup logging
     log_dir = project_dir / '.claude' / 'async-logs'
@@ -165,7 +209,7 @@ def main():
 
     try:
         # Find the latest transcript
-        result = find_latest_transcript()
+        result = find_latest_transcript(TRANSCRIPT_INDEX_PATH, project_dir)
         if not result:
             with open(log_file, 'w') as f:
                 f.write(f"[{datetime.now()}] No transcript file found\n")
@@ -174,8 +218,7 @@ def main():
         session_id, transcript_path = result
 
         # Parse transcript
-        session_data = parse_transcript(transcript_path)
-        transcript_summary = build_transcript_summary(session_data)
+        session_data = stream_transcript(transcript_path)
 
         # Build prompt for claude-md-manager skill
         prompt = f"""Use the /claude-md-manager skill to handle CLAUDE.md for this Stop hook event.
@@ -185,10 +228,10 @@ def main():
 - User messages: {session_data['user_messages']}
 - Assistant messages: {session_data['assistant_messages']}
 - Tool calls: {len(session_data['tool_calls'])}
-- Tools used: {', '.join(set(tc['name'] for tc in session_data['tool_calls'][:10]))}
+- Tools used: {', '.join(dict.fromkeys(tc['name'] for tc in session_data['tool_calls'][:10]))}
 
 **Session Summary:**
-{transcript_summary[:2000]}
+{session_data['summary']}
 
 **Instructions:**
 The claude-md-manager skill will automatically:
@@ -202,32 +245,22 @@ Invoke the skill now.
 
         # Log start with context info
         with open(log_file, 'w') as f:
-            f.write(f"[{datetime.now()}] Starting async CLAUDE.md analysis\n")
-            f.write(f"Project: {project_dir}\n")
-            f.write(f"Session: {session_id}\n")
-            f.write(f"Transcript: {transcript_path}\n")
-            f.write(f"User messages: {session_data['user_messages']}\n")
-            f.write(f"Assistant messages: {session_data['assistant_messages']}\n")
-            f.write(f"Tool calls: {len(session_data['tool_calls'])}\n")
-            f.write(f"Using: /claude-md-manager skill\n")
-            f.write("---\n")
+            # Build the header as one string and write it once
+            f.write(
+                f"[{datetime.now()}] Starting async CLAUDE.md analysis\n"
+                f"Project: {project_dir}\n"
+                f"Session: {session_id}\n"
+                f"Transcript: {transcript_path}\n"
+                f"User messages: {session_data['user_messages']}\n"
+                f"Assistant messages: {session_data['assistant_messages']}\n"
+                f"Tool calls: {len(session_data['tool_calls'])}\n"
+                f"Using: /claude-md-manager skill\n"
+                "---\n"
+            )
             f.flush()
 
             # Launch claude with skill invocation
-            result = subprocess.run(
-                ['claude', '--plugin-dir', f'{project_dir}/plugins/dev-plugin', '--dangerously-skip-permissions'],
-                input=prompt,
-                text=True,
-                stdout=f,
-                stderr=subprocess.STDOUT,
-                cwd=project_dir,
-                timeout=300  # 5 minute timeout
-            )
-
-            # Log completion
-            f.write("---\n")
-            f.write(f"[{datetime.now()}] Async CLAUDE.md analysis complete\n")
-            f.write(f"Exit code: {result.returncode}\n")
+            run_claude(prompt, project_dir, f)
 
         # Exit with success
         sys.exit(0)
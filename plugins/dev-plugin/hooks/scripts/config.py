@@ -55,37 +55,105 @@ Loads from:
 3. System environment variables
 
 Supports ${VARIABLE_NAME} expansion in YAML values.
+
+Parse Cache
+===========
+
+Every hook is a fresh process, so parsed config files are memoized on disk
+in a private per-user pickle under ~/.claude/plugins/dev-plugin/.cache/
+(keyed by path + st_mtime_ns). Unchanged files are
+served from the cache without importing yaml or re-parsing.
+
+The merged (not yet ${VAR}-expanded) config is stored in the same pickle,
+keyed by the mtime and size of all six config locations. A hit costs six
+stat() calls and one pickle.load; expansion still runs on every load so
+changes to the process environment are always honoured. .env values are
+never written to the cache: they are re-read (only when the config
+references a ${VAR}), which keeps secrets out of it.
 """
 
+import copy
+import functools
 import os
+import pickle
+import re
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Tuple
 import logging
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# yaml module and loader class, imported lazily by parse_yaml
+_yaml_module = None
+_yaml_loader = None
+
+# ${VAR} references expanded in config values
+ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+# Private per-user directory for the hooks' on-disk caches (see write_private_file)
+CACHE_DIR = Path.home() / '.claude' / 'plugins' / 'dev-plugin' / '.cache'
+
+# Cache of parsed config files: {path: (st_mtime_ns, parsed_dict)}
+# plus merged configs: {'merged:<project>': (stamps, defaults, config)}
+CONFIG_CACHE_PATH = CACHE_DIR / 'config.pkl'
+
+
+def write_private_file(path: Path, data: bytes) -> None:
+    """
+    Atomically replace a cache file with `data`, readable by its owner only.
+
+    The temp file is created exclusively with mode 0o600 in a 0o700
+    directory, so it can't be pre-created or read by another user.
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+    try:
+        fd = os.open(tmp_path, flags, 0o600)
+    except FileExistsError:
+        # Left behind by an earlier process that had the same pid
+        os.unlink(tmp_path)
+        fd = os.open(tmp_path, flags, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 def load_env_file(env_path: Path) -> Dict[str, str]:
     """Load environment variables from .env file."""
     env_vars = {}
-    if not env_path.exists():
-        return env_vars
-
     try:
+        # EAFP: a missing file costs one failed open, not stat + open
         with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if not line or line.startswith('#'):
-                    continue
-                # Parse KEY=VALUE
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    # Remove quotes if present
-                    value = value.strip('"').strip("'")
-                    env_vars[key.strip()] = value
+            text = f.read()
+        # One read and a C-level split instead of per-line file iteration
+        for line in text.splitlines():
+            line = line.strip()
+            # Skip comments and empty lines
+            if not line or line.startswith('#'):
+                continue
+            # Parse KEY=VALUE
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            # Remove a matching pair of surrounding quotes
+            if len(value) > 1 and value[0] in '"\'' and value[-1] == value[0]:
+                value = value[1:-1]
+            env_vars[key.strip()] = value
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.warning(f"Failed to load .env file {env_path}: {e}")
 
@@ -95,16 +163,16 @@ def load_env_file(env_path: Path) -> Dict[str, str]:
 def expand_env_vars(value: Any, env_vars: Dict[str, str]) -> Any:
     """Recursively expand ${VAR} references in config values."""
     if isinstance(value, str):
-        # Expand ${VAR} syntax
-        import re
-        pattern = r'\$\{([^}]+)\}'
+        # Most values contain no ${VAR} reference - skip the regex engine
+        if '${' not in value:
+            return value
 
         def replace_var(match):
             var_name = match.group(1)
             # Check custom env_vars first, then os.environ
             return env_vars.get(var_name) or os.environ.get(var_name, match.group(0))
 
-        return re.sub(pattern, replace_var, value)
+        return ENV_VAR_PATTERN.sub(replace_var, value)
     elif isinstance(value, dict):
         return {k: expand_env_vars(v, env_vars) for k, v in value.items()}
     elif isinstance(value, list):
@@ -114,28 +182,53 @@ def expand_env_vars(value: Any, env_vars: Dict[str, str]) -> Any:
 
 
 def deep_merge(base: Dict, override: Dict) -> Dict:
-    """Deep merge two dictionaries, with override taking precedence."""
-    result = base.copy()
+    """
+    Deep merge two dictionaries, with override taking precedence.
 
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
+    Neither input is modified. Only the nested dicts that the override
+    actually touches are copied; untouched subtrees are shared with base.
+    An empty side short-circuits and the other input is returned as is.
+    """
+    if not override or base is override:
+        return base
+    if not base:
+        return override
+
+    result = base.copy()
+    stack = [(result, override)]
+
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                # Copy-on-write: never mutate a dict that belongs to base
+                current = target[key] = current.copy()
+                stack.append((current, value))
+            else:
+                target[key] = value
 
     return result
 
 
+def parse_yaml(text: str) -> Any:
+    """Parse YAML text, using the libyaml C loader when available."""
+    global _yaml_module, _yaml_loader
+    if _yaml_module is None:
+        # Imported on first use only: parse-cache hits never need yaml
+        import yaml
+        _yaml_module = yaml
+        _yaml_loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return _yaml_module.load(text, Loader=_yaml_loader)
+
+
 def load_yaml_file(yaml_path: Path) -> Optional[Dict]:
     """Load YAML configuration from a .yaml file."""
-    if not yaml_path.exists():
-        return None
-
     try:
-        import yaml
         with open(yaml_path, 'r') as f:
-            content = f.read()
-            return yaml.safe_load(content) or {}
+            return parse_yaml(f.read()) or {}
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logger.warning(f"Failed to load YAML file {yaml_path}: {e}")
         return None
@@ -143,29 +236,17 @@ def load_yaml_file(yaml_path: Path) -> Optional[Dict]:
 
 def load_legacy_md_file(md_path: Path) -> Optional[Dict]:
     """Load YAML frontmatter from legacy .local.md file."""
-    if not md_path.exists():
-        return None
-
     try:
-        import yaml
-        content = md_path.read_text()
+        with open(md_path, 'r') as f:
+            content = f.read()
 
         # Parse YAML frontmatter (between --- markers)
         if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 2:
-                yaml_content = parts[1]
-                config = yaml.safe_load(yaml_content) or {}
-
-                # Show deprecation warning
-                logger.warning(
-                    f"\n⚠️  DEPRECATION WARNING: Using legacy config format (.local.md)\n"
-                    f"   Location: {md_path}\n"
-                    f"   Please migrate to YAML + .env format for better security.\n"
-                    f"   Run: python plugins/dev-plugin/migrate-config.py\n"
-                )
-
-                return config
+            end = content.find('\n---', 3)
+            yaml_content = content[3:end] if end != -1 else content[3:]
+            return parse_yaml(yaml_content) or {}
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logger.warning(f"Failed to load legacy .md file {md_path}: {e}")
         return None
@@ -173,64 +254,134 @@ def load_legacy_md_file(md_path: Path) -> Optional[Dict]:
     return None
 
 
-def get_default_config() -> Dict:
-    """Return default configuration structure."""
-    return {
+def warn_legacy_config(md_path: Path) -> None:
+    """Show the deprecation warning for a legacy .local.md config in use."""
+    logger.warning(
+        f"\n⚠️  DEPRECATION WARNING: Using legacy config format (.local.md)\n"
+        f"   Location: {md_path}\n"
+        f"   Please migrate to YAML + .env format for better security.\n"
+        f"   Run: python plugins/dev-plugin/migrate-config.py\n"
+    )
+
+
+def load_parse_cache() -> Dict[str, Tuple]:
+    """Load the on-disk parse cache (empty dict if missing or unreadable)."""
+    try:
+        with open(CONFIG_CACHE_PATH, 'rb') as f:
+            # Only trust a cache file we own
+            if os.fstat(f.fileno()).st_uid != os.getuid():
+                return {}
+            cache = pickle.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_parse_cache(cache: Dict[str, Tuple]) -> None:
+    """Atomically write the parse cache back to disk."""
+    try:
+        write_private_file(CONFIG_CACHE_PATH, pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception as e:
+        logger.debug(f"Failed to write config cache {CONFIG_CACHE_PATH}: {e}")
+
+
+def load_cached(
+    path: Path,
+    loader: Callable[[Path], Optional[Dict]],
+    cache: Dict[str, Tuple]
+) -> Tuple[Optional[Dict], bool]:
+    """
+    Load a config file through the parse cache.
+
+    Returns:
+        Tuple of (parsed config or None, whether the cache was updated)
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, False
+
+    key = str(path)
+    entry = cache.get(key)
+    if entry is not None and entry[0] == mtime_ns:
+        return entry[1], False
+
+    parsed = loader(path)
+    if parsed is None:
+        return None, False
+
+    cache[key] = (mtime_ns, parsed)
+    return parsed, True
+
+
+# Built-in defaults (lowest priority). Shared, never mutated: deep_merge
+# copies whatever it changes, so load_config can start from it directly.
+_DEFAULT_CONFIG = {
+    'enabled': True,
+    'observability': {
+        'enabled': False,
+        'debug': False,
+        'langfuse': {
+            'enabled': False,
+            'auto_start': False,
+            'host': 'http://localhost:3000',
+            'public_key': '',
+            'secret_key': '',
+            'userId': '',
+            'version': '1.0.0',
+            'tags': [],
+            'compose_path': ''
+        }
+    },
+    'autoformat': {
         'enabled': True,
-        'observability': {
+        'batch': {
             'enabled': False,
-            'debug': False,
-            'langfuse': {
-                'enabled': False,
-                'auto_start': False,
-                'host': 'http://localhost:3000',
-                'public_key': '',
-                'secret_key': '',
-                'userId': '',
-                'version': '1.0.0',
-                'tags': [],
-                'compose_path': ''
-            }
-        },
-        'autoformat': {
-            'enabled': True
-        },
-        'git_checkpoint': {
-            'enabled': True
+            'window': 0.5,
+            'workers': 1
+        }
+    },
+    'git_checkpoint': {
+        'enabled': True
+    },
+    'notifications': {
+        'enabled': True,
+        'mac_notification': True,
+        'use_dialog': False,
+        'tts': False
+    },
+    'claude_md_management': {
+        'auto_init': True,
+        'auto_update': True,
+        'update_threshold': 3,
+        'max_file_size': 10240,
+        'backup_before_update': True
+    },
+    'quality_check': {
+        'enabled': True,
+        'typescript': {
+            'enabled': True,
+            'command': 'npx tsc --noEmit'
         },
-        'notifications': {
+        'python': {
             'enabled': True,
-            'mac_notification': True,
-            'use_dialog': False,
-            'tts': False
+            'command': 'mypy .'
         },
-        'claude_md_management': {
-            'auto_init': True,
-            'auto_update': True,
-            'update_threshold': 3,
-            'max_file_size': 10240,
-            'backup_before_update': True
+        'go': {
+            'enabled': True,
+            'command': 'go vet ./...'
         },
-        'quality_check': {
+        'rust': {
             'enabled': True,
-            'typescript': {
-                'enabled': True,
-                'command': 'npx tsc --noEmit'
-            },
-            'python': {
-                'enabled': True,
-                'command': 'mypy .'
-            },
-            'go': {
-                'enabled': True,
-                'command': 'go vet ./...'
-            },
-            'rust': {
-                'enabled': True,
-                'command': 'cargo check'
-            }
+            'command': 'cargo check'
         }
     }
+}
+
+
+def get_default_config() -> Dict:
+    """Return a fresh copy of the default configuration structure."""
+    return copy.deepcopy(_DEFAULT_CONFIG)
 
 
 def load_config(project_dir: Path) -> Dict:
@@ -257,49 +408,124 @@ def load_config(project_dir: Path) -> Dict:
     2. .claude/.env (project - overrides global)
     3. System environment variables
 
+    Results are memoized per process, and across processes via the parse
+    cache, while none of the config or .env files change (mtime and size).
+
     Args:
         project_dir: Path to the project directory
 
     Returns:
         Merged configuration dictionary with expanded environment variables
     """
-    # Start with defaults
-    config = get_default_config()
+    project_dir = Path(project_dir)
+    stamps = []
+    for path in get_config_paths(project_dir):
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
 
-    # Define paths
-    project_yaml = project_dir / '.claude' / 'dev-plugin.yaml'
-    project_md = project_dir / '.claude' / 'dev-plugin.local.md'
-    project_env = project_dir / '.claude' / '.env'
+    # Callers get their own copy; the memoized dict must stay pristine
+    return copy.deepcopy(_load_config_memoized(project_dir, tuple(stamps)))
+
+
+def get_config_paths(project_dir: Path) -> Tuple[Path, ...]:
+    """
+    Return all config locations for a project.
 
+    Order: project YAML, project legacy .md, project .env,
+    global YAML, global legacy .md, global .env.
+    """
+    project_claude = project_dir / '.claude'
     global_dir = Path.home() / '.claude' / 'plugins' / 'dev-plugin'
-    global_yaml = global_dir / 'dev-plugin.yaml'
-    global_md = global_dir / 'settings.local.md'
-    global_env = global_dir / '.env'
+    return (
+        project_claude / 'dev-plugin.yaml',
+        project_claude / 'dev-plugin.local.md',
+        project_claude / '.env',
+        global_dir / 'dev-plugin.yaml',
+        global_dir / 'settings.local.md',
+        global_dir / '.env',
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_memoized(project_dir: Path, stamps: Tuple[Optional[Tuple[int, int]], ...]) -> Dict:
+    """Load, merge and expand config (see load_config); `stamps` keys the caches."""
+    # Warn on every load that uses a legacy .md file (one without a YAML
+    # file beside it), cached or not: the loaders below may be skipped
+    paths = get_config_paths(project_dir)
+    for yaml_index, md_index in ((3, 4), (0, 1)):
+        if stamps[yaml_index] is None and stamps[md_index] is not None:
+            warn_legacy_config(paths[md_index])
+
+    parse_cache = load_parse_cache()
+    merged_key = f'merged:{project_dir}'
+    entry = parse_cache.get(merged_key)
+
+    # Defaults are part of the key so a plugin update invalidates the entry
+    if entry is not None and entry[0] == stamps and entry[1] == _DEFAULT_CONFIG:
+        config = entry[2]
+    else:
+        config = merge_config_files(project_dir, parse_cache)
+        parse_cache[merged_key] = (stamps, _DEFAULT_CONFIG, config)
+        save_parse_cache(parse_cache)
 
-    # Load environment variables (global first, then project overrides)
-    env_vars = {}
-    env_vars.update(load_env_file(global_env))
+    # One C-level scan first: most configs reference no ${VAR} at all, and
+    # then the .env files and the recursive expansion can be skipped entirely
+    if '${' not in repr(config):
+        return config
+
+    # Expand environment variables in the final config
+    return expand_env_vars(config, load_env_vars(project_dir))
+
+
+def load_env_vars(project_dir: Path) -> Dict[str, str]:
+    """Load .env variables for a project (global first, then project overrides)."""
+    paths = get_config_paths(project_dir)
+    project_env, global_env = paths[2], paths[5]
+    env_vars = load_env_file(global_env)
     env_vars.update(load_env_file(project_env))
+    return env_vars
+
+
+def merge_config_files(project_dir: Path, parse_cache: Dict[str, Tuple]) -> Dict:
+    """
+    Read and merge all config tiers for a project.
+
+    Args:
+        project_dir: Path to the project directory
+        parse_cache: Parse cache, updated in place with any newly parsed files
+
+    Returns:
+        Merged config before ${VAR} expansion
+    """
+    # Start with defaults (not copied: nothing below mutates them)
+    config = _DEFAULT_CONFIG
+
+    # Define paths
+    (project_yaml, project_md, _,
+     global_yaml, global_md, _) = get_config_paths(project_dir)
+
+    # Parsed files are reused across hook invocations while unchanged
+    # (the caller saves the cache, so the "updated" flags are not needed)
 
     # Load global config (YAML preferred, fallback to .md)
-    global_config = load_yaml_file(global_yaml)
+    global_config, _ = load_cached(global_yaml, load_yaml_file, parse_cache)
     if global_config is None:
-        global_config = load_legacy_md_file(global_md)
-
-    if global_config:
-        config = deep_merge(config, global_config)
+        global_config, _ = load_cached(global_md, load_legacy_md_file, parse_cache)
 
     # Load project config (YAML preferred, fallback to .md)
-    project_config = load_yaml_file(project_yaml)
+    project_config, _ = load_cached(project_yaml, load_yaml_file, parse_cache)
     if project_config is None:
-        project_config = load_legacy_md_file(project_md)
+        project_config, _ = load_cached(project_md, load_legacy_md_file, parse_cache)
+
+    if global_config:
+        config = deep_merge(config, global_config)
 
     if project_config:
         config = deep_merge(config, project_config)
 
-    # Expand environment variables in the final config
-    config = expand_env_vars(config, env_vars)
-
     return config
 
 
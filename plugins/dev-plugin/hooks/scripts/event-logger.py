@@ -4,43 +4,60 @@ Simple JSONL event logger for Claude Code hooks.
 Logs all hook events to a timestamped JSONL file.
 """
 
-import json
+import os
 import sys
-from datetime import datetime
-from pathlib import Path
+import time
+
+# orjson if installed, else stdlib json (this hook runs on every event, so
+# it declares no dependencies for uv to resolve first)
+from json_codec import json_dumps, json_loads
+
 
 def main():
     """Log hook event to JSONL file."""
     # Read hook input from stdin
     try:
-        hook_input = json.loads(sys.stdin.read())
-    except (json.JSONDecodeError, ValueError):
+        hook_input = json_loads(sys.stdin.buffer.read())
+    except ValueError:  # json/orjson decode errors
         hook_input = {"error": "Failed to parse stdin"}
 
-    # Get project directory
-    project_dir = Path.cwd()
+    # Create log directory (relative to the project cwd; os.path avoids
+    # the pathlib import, the costliest import in this script)
+    log_dir = os.path.join('.claude', 'observability', 'hook-events')
+    os.makedirs(log_dir, exist_ok=True)
 
-    # Create log directory
-    log_dir = project_dir / '.claude' / 'observability' / 'hook-events'
-    log_dir.mkdir(parents=True, exist_ok=True)
+    # One clock read for both the file name and the timestamp; formatting
+    # the local time by hand avoids importing datetime
+    now = time.time()
+    tm = time.localtime(now)
+    today = f'{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}'
+    timestamp = (f'{today}T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}'
+                 f'.{int(now % 1 * 1_000_000):06d}')
 
     # Log file: one per day
-    today = datetime.now().strftime('%Y-%m-%d')
-    log_file = log_dir / f'events-{today}.jsonl'
+    log_file = os.path.join(log_dir, f'events-{today}.jsonl')
 
     # Create log entry
     log_entry = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp,
         'event': hook_input.get('hook_event_name', 'unknown'),
         'data': hook_input
     }
 
-    # Append to JSONL file
-    with log_file.open('a') as f:
-        f.write(json.dumps(log_entry) + '\n')
+    # Append to JSONL file: one write() on an O_APPEND fd keeps each line
+    # intact when several hooks log at once, without any locking. A short
+    # write (e.g. disk nearly full) is finished off rather than leaving a
+    # truncated record that would corrupt the next line
+    line = memoryview(json_dumps(log_entry) + b'\n')
+    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        while line:
+            line = line[os.write(fd, line):]
+    finally:
+        os.close(fd)
 
     # Return success (don't suppress output)
-    print(json.dumps({"success": True, "suppressOutput": True}))
+    print(json_dumps({"success": True, "suppressOutput": True}).decode())
 
 
 if __name__ == '__main__':
@@ -34,67 +34,45 @@ class GitCheckpointer:
         self.project_dir = project_dir
         self.config = config or {}
 
-    def is_git_repo(self) -> bool:
-        """Check if current directory is a git repository."""
-        try:
-            result = subprocess.run(
-                ['git', 'rev-parse', '--git-dir'],
-                cwd=self.project_dir,
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+    def scan_status(self) -> Tuple[bool, bool, List[str]]:
+        """
+        Probe the repository with a single `git status` call.
 
-    def has_merge_conflicts(self) -> bool:
-        """Check if there are unresolved merge conflicts."""
+        Returns:
+            Tuple of (is git repo, has merge conflicts, changed tracked files)
+        """
         try:
-            # Check for merge conflicts
             result = subprocess.run(
-                ['git', 'diff', '--name-only', '--diff-filter=U'],
+                ['git', 'status', '--porcelain=v2', '-z', '--untracked-files=no'],
                 cwd=self.project_dir,
                 capture_output=True,
                 text=True,
                 timeout=5
             )
-
-            conflicted_files = result.stdout.strip()
-            return len(conflicted_files) > 0
         except Exception:
-            return False
-
-    def get_changed_files(self) -> List[str]:
-        """Get list of changed files (staged + unstaged)."""
-        try:
-            # Get both staged and unstaged changes
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=self.project_dir,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode != 0:
-                return []
-
-            # Parse git status output
-            changed_files = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    # Format: "XY filename"
-                    # X = staged status, Y = unstaged status
-                    status = line[:2]
-                    filename = line[3:]
-
-                    # Skip untracked files (marked as ??)
-                    if status != '??':
-                        changed_files.append(filename)
-
-            return changed_files
-        except Exception:
-            return []
+            return False, False, []
+
+        if result.returncode != 0:
+            # Not a git repository (or git unusable here)
+            return False, False, []
+
+        has_conflicts = False
+        changed_files = []
+        records = iter(result.stdout.split('\0'))
+        for record in records:
+            # Ordinary: "1 XY sub mH mI mW hH hI path"
+            if record.startswith('1 '):
+                changed_files.append(record.split(' ', 8)[8])
+            # Renamed/copied: "2 XY sub mH mI mW hH hI Xscore path", then origPath
+            elif record.startswith('2 '):
+                changed_files.append(record.split(' ', 9)[9])
+                next(records, None)
+            # Unmerged: "u XY sub m1 m2 m3 mW h1 h2 h3 path"
+            elif record.startswith('u '):
+                has_conflicts = True
+                changed_files.append(record.split(' ', 10)[10])
+
+        return True, has_conflicts, changed_files
 
     def stage_all_changes(self) -> Tuple[bool, str]:
         """Stage all modified files."""
@@ -114,18 +92,26 @@ class GitCheckpointer:
         except Exception as e:
             return False, f"Error staging changes: {str(e)}"
 
-    def get_diff_summary(self) -> str:
-        """Get a brief summary of staged changes."""
+    def get_diff_summary(self, against_head: bool = False) -> Optional[str]:
+        """
+        Get a brief summary of staged changes.
+
+        With against_head, summarize every tracked change against HEAD instead
+        (what `git commit -a` will stage); returns None if there is no HEAD yet.
+        """
         try:
-            # Get diffstat for staged changes
+            # Get diffstat for staged changes (or all tracked changes)
             result = subprocess.run(
-                ['git', 'diff', '--cached', '--stat'],
+                ['git', 'diff', 'HEAD' if against_head else '--cached', '--stat'],
                 cwd=self.project_dir,
                 capture_output=True,
                 text=True,
                 timeout=10
             )
 
+            if against_head and result.returncode != 0:
+                return None
+
             if result.returncode == 0 and result.stdout.strip():
                 # Return condensed summary (first 3 files + summary line)
                 lines = result.stdout.strip().split('\n')
@@ -145,35 +131,30 @@ class GitCheckpointer:
         # Get file count
         file_count = len(changed_files)
 
-        # Get file types
-        file_types = set()
-        for f in changed_files:
-            ext = Path(f).suffix
-            if ext:
-                file_types.add(ext)
-
-        # Build commit message
-        message_parts = []
-
         # Header
         if file_count == 1:
-            message_parts.append(f"Auto-checkpoint: Modified {changed_files[0]}")
+            header = f"Auto-checkpoint: Modified {changed_files[0]}"
         else:
+            # File types, same rules as Path.suffix but without building a
+            # Path per file: the last dot of the basename, not leading/trailing
+            file_types = set()
+            for f in changed_files:
+                name = f[f.rfind('/') + 1:]
+                dot = name.rfind('.')
+                if 0 < dot < len(name) - 1:
+                    file_types.add(name[dot:])
             file_types_str = ', '.join(sorted(file_types)) if file_types else 'various'
-            message_parts.append(f"Auto-checkpoint: Modified {file_count} files ({file_types_str})")
-
-        # Add blank line
-        message_parts.append("")
-
-        # Add diff summary
-        message_parts.append("Changes:")
-        message_parts.append(diff_summary)
-
-        # Add footer
-        message_parts.append("")
-        message_parts.append("Committed by: Claude Code dev-plugin")
-
-        return '\n'.join(message_parts)
+            header = f"Auto-checkpoint: Modified {file_count} files ({file_types_str})"
+
+        # Header, diff summary and footer
+        return (
+            f"{header}\n"
+            f"\n"
+            f"Changes:\n"
+            f"{diff_summary}\n"
+            f"\n"
+            f"Committed by: Claude Code dev-plugin"
+        )
 
     def create_checkpoint(self) -> Tuple[bool, str]:
         """Create a git checkpoint commit."""
@@ -181,30 +162,35 @@ class GitCheckpointer:
         if not self.config.get('git_checkpoint', {}).get('enabled', True):
             return True, "Git checkpointing disabled in config"
 
+        # Repo, conflict and changed-file checks share one git process
+        is_repo, has_conflicts, changed_files = self.scan_status()
+
         # Check if git repo exists
-        if not self.is_git_repo():
+        if not is_repo:
             # Skip silently as per requirements
             return True, "Not a git repository, skipping checkpoint"
 
         # Check for merge conflicts
-        if self.has_merge_conflicts():
+        if has_conflicts:
             # Block if conflicts exist (exit 2)
             return False, "⛔ Cannot checkpoint: unresolved merge conflicts detected. Please resolve conflicts first."
 
-        # Get changed files
-        changed_files = self.get_changed_files()
-
         if not changed_files:
             # No changes to commit
             return True, "No changes to checkpoint"
 
-        # Stage all changes
-        success, message = self.stage_all_changes()
-        if not success:
-            return False, f"⛔ Failed to stage changes: {message}"
+        # Get diff summary before staging, then let `commit -a` stage
+        # modified/deleted files itself: one git process fewer than add -u
+        diff_summary = self.get_diff_summary(against_head=True)
+        commit_cmd = ['git', 'commit', '-a', '-m']
 
-        # Get diff summary
-        diff_summary = self.get_diff_summary()
+        if diff_summary is None:
+            # No HEAD yet (first commit): stage explicitly and diff the index
+            success, message = self.stage_all_changes()
+            if not success:
+                return False, f"⛔ Failed to stage changes: {message}"
+            diff_summary = self.get_diff_summary()
+            commit_cmd = ['git', 'commit', '-m']
 
         # Generate commit message
         commit_message = self.create_commit_message(changed_files, diff_summary)
@@ -212,7 +198,7 @@ class GitCheckpointer:
         # Create commit
         try:
             result = subprocess.run(
-                ['git', 'commit', '-m', commit_message],
+                commit_cmd + [commit_message],
                 cwd=self.project_dir,
                 capture_output=True,
                 text=True,
@@ -220,16 +206,12 @@ class GitCheckpointer:
             )
 
             if result.returncode == 0:
-                # Extract commit hash
+                # Extract commit hash from git's "[branch (root-commit) abc1234] subject"
                 commit_hash = None
-                for line in result.stdout.split('\n'):
-                    if 'checkpoint' in line.lower():
-                        # Try to extract short hash
-                        parts = line.split()
-                        for part in parts:
-                            if len(part) == 7 and all(c in '0123456789abcdef' for c in part):
-                                commit_hash = part
-                                break
+                header = result.stdout.partition('\n')[0]
+                end = header.find(']')
+                if header.startswith('[') and end != -1:
+                    commit_hash = header[1:end].rsplit(' ', 1)[-1]
 
                 if commit_hash:
                     return True, f"✓ Created checkpoint commit {commit_hash} with {len(changed_files)} file(s)"
@@ -253,7 +235,7 @@ def main():
             hook_input = {}
 
         # Get project directory
-        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd())
 
         # Load configuration
         config = load_config(project_dir)
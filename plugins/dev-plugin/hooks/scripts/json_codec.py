@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Shared JSON codec for dev-plugin hooks.
+
+orjson parses JSONL several times faster and encodes straight to compact
+UTF-8 bytes. It is used only when already installed: hooks don't declare
+it as a script dependency, so `uv run` has nothing to resolve first.
+Otherwise stdlib json is used with the same bytes-in/bytes-out interface.
+"""
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+__all__ = ['json_dumps', 'json_loads']
@@ -10,22 +10,38 @@ Sends Claude Code traces to Langfuse after each response.
 Reads configuration from .claude/dev-plugin.local.md
 """
 
-import json
+from __future__ import annotations
+
+import atexit
 import os
+import queue
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-# Import shared config loader
+# Import shared config loader and helpers
 from config import load_config
+from json_codec import json_dumps, json_loads
+from transcript_index import INDEX_DIR, find_latest_transcript
 
-# Check if Langfuse is available
-try:
+# The langfuse SDK is heavy to import; main() imports it only once tracing
+# is known to be enabled and configured
+if TYPE_CHECKING:
     from langfuse import Langfuse
-except ImportError:
-    print("Error: langfuse package not installed. Run: pip install langfuse", file=sys.stderr)
-    sys.exit(0)
+
+# Exporter batching: export in batches of flush_at spans rather than on a
+# timer mid-run; the rest goes out at shutdown. flush_at must stay well below
+# the OpenTelemetry span queue size (2048): spans arriving while the queue
+# is full are dropped, so large backfills need batches exported as they go
+LANGFUSE_FLUSH_AT = 512
+LANGFUSE_FLUSH_INTERVAL = 3600
+
+# Transcript index for find_latest_transcript (agent transcripts included)
+TRANSCRIPT_INDEX_PATH = INDEX_DIR / ".langfuse-transcript-index.json"
 
 
 # ========================================
@@ -38,13 +54,26 @@ class Logger:
     def __init__(self, log_file: Path, debug_mode: bool = False):
         self.log_file = log_file
         self.debug_mode = debug_mode
+        self._file = None
+        self._lock = threading.Lock()  # TraceRecorder logs from its worker
+        # Timestamps have one-second resolution; format once per second
+        self._ts_second = None
+        self._ts_text = ""
 
     def log(self, level: str, message: str) -> None:
         """Log a message to the log file."""
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(self.log_file, "a") as f:
-            f.write(f"{timestamp} [{level}] {message}\n")
+        with self._lock:
+            now = int(time.time())
+            if now != self._ts_second:
+                self._ts_second = now
+                self._ts_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            if self._file is None:
+                # Opened on first use and held until exit, rather than an
+                # open/close round-trip per line in debug mode
+                self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.log_file, "a", buffering=1)
+                atexit.register(self._file.close)
+            self._file.write(f"{self._ts_text} [{level}] {message}\n")
 
     def debug(self, message: str) -> None:
         """Log a debug message (only if debug mode is enabled)."""
@@ -56,20 +85,25 @@ class Logger:
 # STATE MANAGEMENT
 # ========================================
 
+# Subagent transcripts are processed on a thread pool; each records its
+# progress in the shared state dict and saves it
+_state_lock = threading.Lock()
+
+
 def load_state(state_file: Path) -> dict:
     """Load the state file containing session tracking info."""
-    if not state_file.exists():
-        return {}
     try:
-        return json.loads(state_file.read_text())
-    except (json.JSONDecodeError, IOError):
+        return json_loads(state_file.read_bytes())
+    except (ValueError, OSError):  # Missing, unreadable, or corrupt
         return {}
 
 
 def save_state(state_file: Path, state: dict) -> None:
-    """Save the state file."""
+    """Atomically save the state file (write to temp file, then rename)."""
     state_file.parent.mkdir(parents=True, exist_ok=True)
-    state_file.write_text(json.dumps(state, indent=2))
+    tmp_path = state_file.with_name(f"{state_file.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(json_dumps(state))
+    os.replace(tmp_path, state_file)
 
 
 # ========================================
@@ -85,9 +119,8 @@ def get_content(msg: dict) -> Any:
     return None
 
 
-def is_tool_result(msg: dict) -> bool:
-    """Check if a message contains tool results."""
-    content = get_content(msg)
+def is_tool_result(content: Any) -> bool:
+    """Check if message content (from get_content) contains tool results."""
     if isinstance(content, list):
         return any(
             isinstance(item, dict) and item.get("type") == "tool_result"
@@ -127,6 +160,10 @@ def merge_assistant_parts(parts: list) -> dict:
     """Merge multiple assistant message parts into one."""
     if not parts:
         return {}
+    if len(parts) == 1:
+        # Most assistant messages arrive in one part; nothing to merge, and
+        # the parts are only read from here on, so no copy is needed
+        return parts[0]
 
     merged_content = []
     for part in parts:
@@ -151,47 +188,56 @@ def merge_assistant_parts(parts: list) -> dict:
 # TRANSCRIPT MANAGEMENT
 # ========================================
 
-def find_latest_transcript(logger: Logger) -> tuple[str, Path] | None:
-    """Find the most recently modified transcript file.
+def read_new_lines(transcript_file: Path, file_state: dict) -> tuple[list[bytes], int]:
+    """Read the complete lines appended since the last run.
 
-    Claude Code stores transcripts as *.jsonl files directly in the project directory.
-    Main conversation files have UUID names, agent files have agent-*.jsonl names.
-    The session ID is stored inside each JSON line.
-    """
-    projects_dir = Path.home() / ".claude" / "projects"
+    Seeks to the byte offset recorded in file_state instead of re-reading
+    the whole transcript. A trailing line without a newline is still being
+    written and is left for the next run.
 
-    if not projects_dir.exists():
-        logger.debug(f"Projects directory not found: {projects_dir}")
-        return None
-
-    latest_file = None
-    latest_mtime = 0
+    Returns (new lines, byte offset to record as last_offset).
+    """
+    offset = file_state.get("last_offset")
+
+    # Transcripts are append-only: an unchanged size means nothing new, and
+    # a stat is cheaper than opening the file to find that out
+    if offset is not None and transcript_file.stat().st_size == offset:
+        return [], offset
+
+    with open(transcript_file, "rb") as f:
+        if offset is None:
+            # State written before byte offsets: skip already-processed lines
+            offset = 0
+            for _ in range(file_state.get("last_line", 0)):
+                line = f.readline()
+                if not line:
+                    break
+                offset += len(line)
+        else:
+            f.seek(offset)
+        data = f.read()
+
+    # Split on b"\n" only, so each line's byte length (+1) is exact and
+    # callers can map a line back to its file offset
+    end = data.rfind(b"\n") + 1
+    return data[:end].split(b"\n")[:-1], offset + end
+
+
+def has_new_content(transcript_file: Path, file_state: dict) -> bool:
+    """Has the transcript grown past the offset recorded in file_state?"""
+    try:
+        return transcript_file.stat().st_size != file_state.get("last_offset")
+    except OSError:
+        return False
 
-    for project_dir in projects_dir.iterdir():
-        if not project_dir.is_dir():
-            continue
 
-        # Look for all .jsonl files directly in the project directory
-        for transcript_file in project_dir.glob("*.jsonl"):
-            mtime = transcript_file.stat().st_mtime
-            if mtime > latest_mtime:
-                latest_mtime = mtime
-                latest_file = transcript_file
+def is_message_line(line: bytes) -> bool:
+    """Cheap prefilter: could this raw line be a user or assistant message?
 
-    if latest_file:
-        # Extract session ID from the first line of the file
-        try:
-            first_line = latest_file.read_text().split("\n")[0]
-            first_msg = json.loads(first_line)
-            session_id = first_msg.get("sessionId", latest_file.stem)
-            logger.debug(f"Found transcript: {latest_file}, session: {session_id}")
-            return (session_id, latest_file)
-        except (json.JSONDecodeError, IOError, IndexError) as e:
-            logger.debug(f"Error reading transcript {latest_file}: {e}")
-            return None
-
-    logger.debug("No transcript files found")
-    return None
+    Summary, snapshot and other metadata lines mention neither role, so
+    they can be skipped without being decoded.
+    """
+    return b'"user"' in line or b'"assistant"' in line
 
 
 def find_subagent_transcripts(
@@ -206,17 +252,24 @@ def find_subagent_transcripts(
     session_id = session_transcript_path.stem
     subagents_dir = session_dir / session_id / "subagents"
 
-    if not subagents_dir.exists():
+    # One scandir of the flat subagents dir; a missing dir is the common case
+    # and costs a single failed opendir instead of an exists() stat first
+    subagent_files = []
+    try:
+        with os.scandir(subagents_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith("agent-") and name.endswith(".jsonl")):
+                    continue
+                # Extract agent ID from filename: agent-a093c2c.jsonl -> a093c2c
+                agent_id = name[len("agent-"):-len(".jsonl")]
+                transcript_file = Path(entry.path)
+                subagent_files.append((agent_id, transcript_file))
+                logger.debug(f"Found subagent: {agent_id} at {transcript_file}")
+    except OSError:
         logger.debug(f"No subagents directory found: {subagents_dir}")
         return []
 
-    subagent_files = []
-    for transcript_file in subagents_dir.glob("agent-*.jsonl"):
-        # Extract agent ID from filename: agent-a093c2c.jsonl -> a093c2c
-        agent_id = transcript_file.stem.replace("agent-", "")
-        subagent_files.append((agent_id, transcript_file))
-        logger.debug(f"Found subagent: {agent_id} at {transcript_file}")
-
     logger.debug(f"Found {len(subagent_files)} subagent transcript(s)")
     return subagent_files
 
@@ -252,34 +305,34 @@ def create_trace(
     # Get session ID short form (first 8 chars)
     session_id_short = session_id[:8]
 
+    # Index tool results by tool_use_id once, rather than rescanning every
+    # result for each tool call
+    tool_outputs = {}
+    for tr in tool_results:
+        tr_content = get_content(tr)
+        if isinstance(tr_content, list):
+            for item in tr_content:
+                if isinstance(item, dict) and "tool_use_id" in item:
+                    tool_outputs[item["tool_use_id"]] = item.get("content")
+
     # Collect all tool calls and results
     all_tool_calls = []
     for assistant_msg in assistant_msgs:
         tool_calls = get_tool_calls(assistant_msg)
         for tool_call in tool_calls:
-            tool_name = tool_call.get("name", "unknown")
-            tool_input = tool_call.get("input", {})
             tool_id = tool_call.get("id", "")
-
-            # Find matching tool result
-            tool_output = None
-            for tr in tool_results:
-                tr_content = get_content(tr)
-                if isinstance(tr_content, list):
-                    for item in tr_content:
-                        if isinstance(item, dict) and item.get("tool_use_id") == tool_id:
-                            tool_output = item.get("content")
-                            break
-
             all_tool_calls.append({
-                "name": tool_name,
-                "input": tool_input,
-                "output": tool_output,
+                "name": tool_call.get("name", "unknown"),
+                "input": tool_call.get("input", {}),
+                "output": tool_outputs.get(tool_id),
                 "id": tool_id,
             })
 
     # Create trace using the latest Langfuse SDK API (v3+)
-    # Session ID is included in metadata for grouping
+    # Session ID is included in metadata for grouping. Only the turn's root
+    # span becomes the current span; children are started directly on their
+    # parent and ended explicitly, skipping the context bookkeeping of a
+    # nested start_as_current_span per tool call
     with langfuse.start_as_current_span(
         name=f"{session_id_short} - Turn {turn_num}",
         input={"role": "user", "content": user_text},
@@ -290,59 +343,109 @@ def create_trace(
             "session_id_short": session_id_short,
         },
     ) as trace_span:
-            # Create generation for the LLM response
-            langfuse.start_observation(
-                name="Claude Response",
-                as_type="generation",
-                input={"role": "user", "content": user_text},
-                output={"role": "assistant", "content": final_output},
-                model=model,
+        # Create generation for the LLM response
+        trace_span.start_observation(
+            name="Claude Response",
+            as_type="generation",
+            input={"role": "user", "content": user_text},
+            output={"role": "assistant", "content": final_output},
+            model=model,
+            metadata={
+                "tool_count": len(all_tool_calls),
+            },
+        ).end()
+
+        # Create spans for tool calls
+        for tool_call in all_tool_calls:
+            tool_span = trace_span.start_observation(
+                name=f"Tool: {tool_call['name']}",
+                as_type="span",
+                input=tool_call["input"],
+                output=tool_call["output"],
                 metadata={
-                    "tool_count": len(all_tool_calls),
+                    "tool_name": tool_call["name"],
+                    "tool_id": tool_call["id"],
                 },
             )
 
-            # Create spans for tool calls
-            for tool_call in all_tool_calls:
-                with langfuse.start_as_current_span(
-                    name=f"Tool: {tool_call['name']}",
-                    input=tool_call["input"],
-                    metadata={
-                        "tool_name": tool_call["name"],
-                        "tool_id": tool_call["id"],
-                    },
-                ) as tool_span:
-                    # Check if this is a Task tool with subagent data
-                    if tool_call["name"] == "Task" and tool_call["id"] in subagent_data:
-                        agent_id, subagent_tools = subagent_data[tool_call["id"]]
-                        logger.debug(f"Adding {len(subagent_tools)} subagent tool calls for agent {agent_id}")
-
-                        # Create subagent container span
-                        with langfuse.start_as_current_span(
-                            name=f"Subagent: {agent_id}",
-                            metadata={"agent_id": agent_id},
-                        ):
-                            # Create spans for each subagent tool call
-                            for subtool in subagent_tools:
-                                with langfuse.start_as_current_span(
-                                    name=f"Tool: {subtool['name']}",
-                                    input=subtool["input"],
-                                    metadata={"tool_id": subtool["id"]},
-                                ) as subtool_span:
-                                    subtool_span.update(output=subtool["output"])
-
-                    # Update main tool span
-                    tool_span.update(output=tool_call["output"])
-                logger.debug(f"Created span for tool: {tool_call['name']}")
-
-            # Update trace with output
-            trace_span.update(output={"role": "assistant", "content": final_output})
+            # Check if this is a Task tool with subagent data
+            if tool_call["name"] == "Task" and tool_call["id"] in subagent_data:
+                agent_id, subagent_tools = subagent_data[tool_call["id"]]
+                logger.debug(f"Adding {len(subagent_tools)} subagent tool calls for agent {agent_id}")
+
+                # Create subagent container span
+                subagent_span = tool_span.start_observation(
+                    name=f"Subagent: {agent_id}",
+                    as_type="span",
+                    metadata={"agent_id": agent_id},
+                )
+                # Create spans for each subagent tool call
+                for subtool in subagent_tools:
+                    subagent_span.start_observation(
+                        name=f"Tool: {subtool['name']}",
+                        as_type="span",
+                        input=subtool["input"],
+                        output=subtool["output"],
+                        metadata={"tool_id": subtool["id"]},
+                    ).end()
+                subagent_span.end()
+
+            tool_span.end()
+            logger.debug(f"Created span for tool: {tool_call['name']}")
+
+        # Update trace with output
+        trace_span.update(output={"role": "assistant", "content": final_output})
 
     logger.debug(f"Created trace for turn {turn_num}")
 
 
+class TraceRecorder:
+    """Builds Langfuse traces on a worker thread, off the parsing loop.
+
+    process_transcript enqueues each finished turn and moves on to the next
+    one; join() waits for every queued trace before the client is flushed.
+
+    After the first failed turn the rest are skipped, and `checkpoint` keeps
+    (turn_num, end offset) of the last turn traced before it, so state only
+    advances past turns that actually reached Langfuse.
+    """
+
+    def __init__(self, langfuse: Langfuse, logger: Logger):
+        self.langfuse = langfuse
+        self.logger = logger
+        self.failed = False
+        self.checkpoint: tuple[int, int] | None = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def enqueue(self, session_id: str, turn_num: int, user_msg: dict,
+                assistant_msgs: list, tool_results: list, subagent_data: dict,
+                end_offset: int) -> None:
+        """Queue one turn for create_trace; end_offset is where its lines end."""
+        self._queue.put(((session_id, turn_num, user_msg, assistant_msgs, tool_results, subagent_data), end_offset))
+
+    def join(self) -> None:
+        """Wait until every queued turn has been traced (safe to call twice)."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            args, end_offset = item
+            if self.failed:
+                continue  # Retried from the checkpoint on the next run
+            try:
+                create_trace(self.langfuse, *args, self.logger)
+                self.checkpoint = (args[1], end_offset)
+            except Exception as e:
+                self.failed = True
+                self.logger.log("ERROR", f"Failed to create trace for turn {args[1]}: {e}")
+
+
 def process_transcript(
-    langfuse: Langfuse,
+    recorder: TraceRecorder,
     session_id: str,
     transcript_file: Path,
     state: dict,
@@ -353,24 +456,28 @@ def process_transcript(
     """Process a transcript file and create traces for new turns."""
     # Get previous state for this session
     session_state = state.get(session_id, {})
-    last_line = session_state.get("last_line", 0)
     turn_count = session_state.get("turn_count", 0)
 
-    # Read transcript
-    lines = transcript_file.read_text().strip().split("\n")
-    total_lines = len(lines)
+    # Read only what was appended since the last run
+    lines, offset = read_new_lines(transcript_file, session_state)
 
-    if last_line >= total_lines:
-        logger.debug(f"No new lines to process (last: {last_line}, total: {total_lines})")
+    if not lines:
+        logger.debug(f"No new lines to process (offset: {offset})")
         return 0
 
-    # Parse new messages
+    # Parse new messages, keeping the file offset each one starts at
+    start_offset = offset - sum(len(line) + 1 for line in lines)
     new_messages = []
-    for i in range(last_line, total_lines):
+    line_offset = start_offset
+    for line in lines:
+        line_start = line_offset
+        line_offset += len(line) + 1
+        if not is_message_line(line):
+            continue
         try:
-            msg = json.loads(lines[i])
-            new_messages.append(msg)
-        except json.JSONDecodeError:
+            msg = json_loads(line)
+            new_messages.append((line_start, msg))
+        except ValueError:  # json/orjson decode errors
             continue
 
     if not new_messages:
@@ -389,12 +496,15 @@ def process_transcript(
     current_msg_id = None
     current_tool_results = []
 
-    for msg in new_messages:
+    for line_start, msg in new_messages:
         role = msg.get("type") or (msg.get("message", {}).get("role"))
 
         if role == "user":
+            # Extract content once; the checks below all reuse it
+            content = get_content(msg)
+
             # Check if this is a tool result
-            if is_tool_result(msg):
+            if is_tool_result(content):
                 current_tool_results.append(msg)
 
                 # Extract agent IDs from Task tool results
@@ -405,15 +515,13 @@ def process_transcript(
 
                     if agent_id and agent_id in subagent_data:
                         # Find the tool_use_id from the content
-                        content = get_content(msg)
-                        if isinstance(content, list):
-                            for item in content:
-                                if isinstance(item, dict) and item.get("type") == "tool_result":
-                                    tool_id = item.get("tool_use_id")
-                                    if tool_id:
-                                        # Map tool_id -> (agent_id, tool_calls)
-                                        subagent_tools_map[tool_id] = (agent_id, subagent_data[agent_id])
-                                        logger.debug(f"Linked Task tool {tool_id} to subagent {agent_id}")
+                        for item in content:
+                            if isinstance(item, dict) and item.get("type") == "tool_result":
+                                tool_id = item.get("tool_use_id")
+                                if tool_id:
+                                    # Map tool_id -> (agent_id, tool_calls)
+                                    subagent_tools_map[tool_id] = (agent_id, subagent_data[agent_id])
+                                    logger.debug(f"Linked Task tool {tool_id} to subagent {agent_id}")
 
                 continue
 
@@ -427,7 +535,8 @@ def process_transcript(
             if current_user and current_assistants:
                 turns += 1
                 turn_num = turn_count + turns
-                create_trace(langfuse, session_id, turn_num, current_user, current_assistants, current_tool_results, subagent_tools_map, logger)
+                # The turn ends where this new user message starts
+                recorder.enqueue(session_id, turn_num, current_user, current_assistants, current_tool_results, subagent_tools_map, line_start)
 
             # Start new turn
             current_user = msg
@@ -465,11 +574,16 @@ def process_transcript(
     if current_user and current_assistants:
         turns += 1
         turn_num = turn_count + turns
-        create_trace(langfuse, session_id, turn_num, current_user, current_assistants, current_tool_results, subagent_tools_map, logger)
-
-    # Update state
+        recorder.enqueue(session_id, turn_num, current_user, current_assistants, current_tool_results, subagent_tools_map, offset)
+
+    # Save state only once the traces exist: a turn that failed (or never
+    # ran because the process died) must be read again on the next run
+    recorder.join()
+    if recorder.failed:
+        last_turn, offset = recorder.checkpoint or (turn_count, start_offset)
+        turns = last_turn - turn_count
     state[session_id] = {
-        "last_line": total_lines,
+        "last_offset": offset,
         "turn_count": turn_count + turns,
         "updated": datetime.now(timezone.utc).isoformat(),
     }
@@ -496,24 +610,24 @@ def process_subagent_transcript(
 
     # Get previous state
     subagent_state = state.get(state_key, {})
-    last_line = subagent_state.get("last_line", 0)
 
-    # Read transcript
-    lines = transcript_file.read_text().strip().split("\n")
-    total_lines = len(lines)
+    # Read only what was appended since the last run
+    lines, offset = read_new_lines(transcript_file, subagent_state)
 
-    if last_line >= total_lines:
+    if not lines:
         logger.debug(f"No new lines in subagent {agent_id}")
         return []
 
     # Parse new messages
     new_messages = []
-    for i in range(last_line, total_lines):
+    for line in lines:
+        if not is_message_line(line):
+            continue
         try:
-            msg = json.loads(lines[i])
+            msg = json_loads(line)
             new_messages.append(msg)
-        except json.JSONDecodeError:
-            logger.debug(f"Skipping invalid JSON at line {i} in subagent {agent_id}")
+        except ValueError:  # json/orjson decode errors
+            logger.debug(f"Skipping invalid JSON line in subagent {agent_id}")
             continue
 
     if not new_messages:
@@ -539,8 +653,9 @@ def process_subagent_transcript(
                     "timestamp": msg.get("timestamp"),
                 }
 
-        elif role == "user" and is_tool_result(msg):
-            # Match tool result to pending tool
+        elif role == "user":
+            # Match tool results to pending tools (a plain user message has
+            # no tool_result items, so the loop is a no-op for it)
             content = get_content(msg)
             if isinstance(content, list):
                 for item in content:
@@ -555,12 +670,13 @@ def process_subagent_transcript(
     tool_calls.extend(pending_tools.values())
 
     # Update state
-    state[state_key] = {
-        "last_line": total_lines,
-        "tool_count": len(tool_calls),
-        "updated": datetime.now(timezone.utc).isoformat(),
-    }
-    save_state(state_file, state)
+    with _state_lock:
+        state[state_key] = {
+            "last_offset": offset,
+            "tool_count": len(tool_calls),
+            "updated": datetime.now(timezone.utc).isoformat(),
+        }
+        save_state(state_file, state)
 
     logger.debug(f"Processed subagent {agent_id}: {len(tool_calls)} tool calls")
     return tool_calls
@@ -575,7 +691,7 @@ def main():
     script_start = datetime.now()
 
     # Get project directory
-    project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+    project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd())
 
     # Load configuration
     config = load_config(project_dir)
@@ -616,18 +732,6 @@ def main():
         logger.log("ERROR", "Langfuse API keys not configured (check .claude/dev-plugin.local.md)")
         sys.exit(0)
 
-    # Initialize Langfuse client
-    try:
-        langfuse = Langfuse(
-            public_key=public_key,
-            secret_key=secret_key,
-            host=host,
-        )
-        logger.debug(f"Connected to Langfuse at {host}")
-    except Exception as e:
-        logger.log("ERROR", f"Failed to initialize Langfuse client: {e}")
-        sys.exit(0)
-
     # State file location
     state_file = project_dir / '.claude' / 'observability' / 'langfuse_state.json'
 
@@ -635,12 +739,13 @@ def main():
     state = load_state(state_file)
 
     # Find the most recently modified transcript
-    result = find_latest_transcript(logger)
+    result = find_latest_transcript(TRANSCRIPT_INDEX_PATH, project_dir, include_agents=True)
     if not result:
         logger.debug("No transcript file found")
         sys.exit(0)
 
     session_id, transcript_file = result
+    logger.debug(f"Found transcript: {transcript_file}, session: {session_id}")
 
     if not transcript_file:
         logger.debug("No transcript file found")
@@ -648,41 +753,88 @@ def main():
 
     logger.debug(f"Processing session: {session_id}")
 
-    # Find and process subagent transcripts
+    # Find subagent transcripts
     subagent_files = find_subagent_transcripts(transcript_file, logger)
     logger.debug(f"Found {len(subagent_files)} subagent transcript(s)")
 
-    # Process subagent transcripts
+    # Unchanged subagents have no new tool calls; only the rest need processing
     subagent_data = {}  # agent_id -> [tool_calls]
+    changed_subagents = []
     for agent_id, subagent_file in subagent_files:
-        tool_calls = process_subagent_transcript(
-            langfuse, session_id, agent_id, subagent_file, state, state_file, logger
-        )
-        # Store tool calls indexed by agent_id
-        subagent_data[agent_id] = tool_calls
-        logger.debug(f"Subagent {agent_id}: {len(tool_calls)} tool calls")
+        if has_new_content(subagent_file, state.get(f"{session_id}/agent-{agent_id}", {})):
+            changed_subagents.append((agent_id, subagent_file))
+        else:
+            subagent_data[agent_id] = []
+    subagent_files = changed_subagents
+
+    # Nothing appended since the last sync: exit before paying for the
+    # langfuse import and client setup
+    if not subagent_files and not has_new_content(transcript_file, state.get(session_id, {})):
+        logger.debug("No new content since last sync")
+        sys.exit(0)
 
-    # Process the main transcript (with subagent data)
+    # Check if Langfuse is available
     try:
-        turns = process_transcript(langfuse, session_id, transcript_file, state, state_file, subagent_data, logger)
-
-        # Flush to ensure all data is sent
-        langfuse.flush()
-
-        # Log execution time
-        duration = (datetime.now() - script_start).total_seconds()
-        logger.log("INFO", f"Processed {turns} turns in {duration:.1f}s")
+        from langfuse import Langfuse
+    except ImportError:
+        print("Error: langfuse package not installed. Run: pip install langfuse", file=sys.stderr)
+        sys.exit(0)
 
-        if duration > 180:
-            logger.log("WARN", f"Hook took {duration:.1f}s (>3min), consider optimizing")
+    # Initialize Langfuse client
+    try:
+        langfuse = Langfuse(
+            public_key=public_key,
+            secret_key=secret_key,
+            host=host,
+            flush_at=LANGFUSE_FLUSH_AT,
+            flush_interval=LANGFUSE_FLUSH_INTERVAL,
+        )
+        logger.debug(f"Connected to Langfuse at {host}")
+    except Exception as e:
+        logger.log("ERROR", f"Failed to initialize Langfuse client: {e}")
+        sys.exit(0)
 
+    # Process subagent transcripts (independent files, so in parallel)
+    if subagent_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(subagent_files))) as pool:
+            futures = {
+                pool.submit(
+                    process_subagent_transcript,
+                    langfuse, session_id, agent_id, subagent_file, state, state_file, logger,
+                ): agent_id
+                for agent_id, subagent_file in subagent_files
+            }
+            for future in as_completed(futures):
+                agent_id = futures[future]
+                tool_calls = future.result()
+                # Store tool calls indexed by agent_id
+                subagent_data[agent_id] = tool_calls
+                logger.debug(f"Subagent {agent_id}: {len(tool_calls)} tool calls")
+
+    # Process the main transcript (with subagent data); traces are built
+    # by the recorder's worker thread as turns are found
+    recorder = TraceRecorder(langfuse, logger)
+    try:
+        turns = process_transcript(recorder, session_id, transcript_file, state, state_file, subagent_data, logger)
     except Exception as e:
+        turns = None
         logger.log("ERROR", f"Failed to process transcript: {e}")
         import traceback
         logger.debug(traceback.format_exc())
     finally:
+        # shutdown() flushes all pending data itself; a separate flush()
+        # first would just make it do a second, empty export round
+        recorder.join()
         langfuse.shutdown()
 
+    if turns is not None:
+        # Log execution time (including the export)
+        duration = (datetime.now() - script_start).total_seconds()
+        logger.log("INFO", f"Processed {turns} turns in {duration:.1f}s")
+
+        if duration > 180:
+            logger.log("WARN", f"Hook took {duration:.1f}s (>3min), consider optimizing")
+
     sys.exit(0)
 
 
@@ -25,17 +25,21 @@ from typing import Dict, Optional, Tuple
 # Import shared config loader
 from config import load_config
 
-# Import audio notification system
-try:
-    from audio_notify import AudioNotifier
-    AUDIO_NOTIFY_AVAILABLE = True
-except ImportError:
-    AUDIO_NOTIFY_AVAILABLE = False
+# Import audio notifier loader (deferred until notifications are enabled)
+from audio_loader import import_audio_notifier
 
 
 class ApprovalNotifier:
     """Manages approval-needed notifications."""
 
+    # Configured approval voice name -> AudioNotifier voice profile
+    VOICE_MAP = {
+        'Trinoids': 'needs_input',
+        'Bells': 'approval_needed',
+        'Superstar': 'critical',
+        'Wobble': 'waiting'
+    }
+
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
 
@@ -109,7 +113,8 @@ class ApprovalNotifier:
         results = []
 
         # Use audio notification system
-        if AUDIO_NOTIFY_AVAILABLE:
+        AudioNotifier = import_audio_notifier()
+        if AudioNotifier is not None:
             try:
                 # Create notifier with full config
                 notifier = AudioNotifier(notif_config)
@@ -117,14 +122,8 @@ class ApprovalNotifier:
                 # Override context with config settings if provided
                 if 'voice' in approval_config:
                     # Map voice name to profile
-                    voice_map = {
-                        'Trinoids': 'needs_input',
-                        'Bells': 'approval_needed',
-                        'Superstar': 'critical',
-                        'Wobble': 'waiting'
-                    }
                     voice_name = approval_config.get('voice', 'Trinoids')
-                    context['voice_profile'] = voice_map.get(voice_name, 'needs_input')
+                    context['voice_profile'] = self.VOICE_MAP.get(voice_name, 'needs_input')
 
                 # Determine mode based on config
                 force_mode = None
@@ -147,9 +146,11 @@ class ApprovalNotifier:
             # Fallback to system alert sound
             try:
                 import subprocess
-                subprocess.run(['afplay', '/System/Library/Sounds/Glass.aiff'],
-                             capture_output=True, timeout=5)
-                results.append("✓ System alert played (fallback)")
+                # Fire and forget; the hook doesn't wait for playback to end
+                subprocess.Popen(['afplay', '/System/Library/Sounds/Glass.aiff'],
+                                 stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, start_new_session=True)
+                results.append("✓ System alert started (fallback)")
             except Exception:
                 results.append("⚠ Audio system unavailable")
 
@@ -162,12 +163,15 @@ def main():
         # Read hook input from stdin
         hook_input = {}
         try:
-            hook_input = json.loads(sys.stdin.read())
+            # Bytes straight to json.loads: no separate text decode pass
+            raw = sys.stdin.buffer.read()
+            if raw.strip():
+                hook_input = json.loads(raw)
         except Exception:
             pass
 
         # Get project directory
-        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd())
 
         # Load config
         config = load_config(project_dir)
@@ -17,6 +17,8 @@ Features:
 
 import json
 import os
+import re
+import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -24,12 +26,34 @@ from typing import Dict, List, Optional, Tuple
 # Import shared config loader
 from config import load_config
 
-# Import audio notification system
-try:
-    from audio_notify import AudioNotifier
-    AUDIO_NOTIFY_AVAILABLE = True
-except ImportError:
-    AUDIO_NOTIFY_AVAILABLE = False
+# Import audio notifier loader (deferred until notifications are enabled)
+from audio_loader import import_audio_notifier
+
+# One match per `git status --porcelain` line: two status chars, a space, the path
+PORCELAIN_LINE_RE = re.compile(rb'^(..) (.+)$', re.M)
+
+
+def _status_kind(status: bytes) -> Optional[str]:
+    """Classify a two-char porcelain status (modified wins over created/deleted)."""
+    if b'M' in status:
+        return 'modified'
+    if b'A' in status or status == b'??':
+        return 'created'
+    if b'D' in status:
+        return 'deleted'
+    return None
+
+
+# Every porcelain XY status code -> summary kind, so each line is one lookup
+PORCELAIN_STATUS_CHARS = b' MTADRCU?!'
+STATUS_KIND = {
+    status: _status_kind(status)
+    for status in (bytes((x, y)) for x in PORCELAIN_STATUS_CHARS for y in PORCELAIN_STATUS_CHARS)
+    if _status_kind(status) is not None
+}
+
+# Filenames kept per summary list; the *_count fields hold the full totals
+SUMMARY_MAX_FILES = 3
 
 
 class CompletionNotifier:
@@ -45,38 +69,42 @@ class CompletionNotifier:
             'files_modified': [],
             'files_created': [],
             'files_deleted': [],
+            'modified_count': 0,
+            'created_count': 0,
+            'deleted_count': 0,
             'total_changes': 0
         }
 
         try:
-            # Get git status if available
+            # Get git status if available. --no-optional-locks keeps this
+            # read-only: no index refresh write that could hold index.lock
+            # while git-checkpoint commits in the same Stop event
             result = subprocess.run(
-                ['git', 'status', '--porcelain'],
+                ['git', '--no-optional-locks', 'status', '--porcelain'],
                 cwd=self.project_dir,
                 capture_output=True,
-                text=True,
                 timeout=5
             )
 
             if result.returncode == 0:
-                for line in result.stdout.strip().split('\n'):
-                    if not line:
+                # Match the raw bytes: stripping the output would eat the
+                # leading space of a worktree-only status like ' M'
+                for match in PORCELAIN_LINE_RE.finditer(result.stdout):
+                    kind = STATUS_KIND.get(match.group(1))
+                    if kind is None:
                         continue
+                    filename = os.fsdecode(match.group(2))
 
-                    status = line[:2]
-                    filename = line[3:]
-
-                    if 'M' in status:
-                        summary['files_modified'].append(filename)
-                    elif 'A' in status or '??' == status:
-                        summary['files_created'].append(filename)
-                    elif 'D' in status:
-                        summary['files_deleted'].append(filename)
+                    # Count every file but only keep a few names
+                    summary[f'{kind}_count'] += 1
+                    files = summary[f'files_{kind}']
+                    if len(files) < SUMMARY_MAX_FILES:
+                        files.append(filename)
 
                 summary['total_changes'] = (
-                    len(summary['files_modified']) +
-                    len(summary['files_created']) +
-                    len(summary['files_deleted'])
+                    summary['modified_count'] +
+                    summary['created_count'] +
+                    summary['deleted_count']
                 )
 
         except Exception:
@@ -90,12 +118,12 @@ class CompletionNotifier:
             return "Claude Code session completed (no file changes detected)"
 
         parts = []
-        if summary['files_modified']:
-            parts.append(f"Modified: {len(summary['files_modified'])} files")
-        if summary['files_created']:
-            parts.append(f"Created: {len(summary['files_created'])} files")
-        if summary['files_deleted']:
-            parts.append(f"Deleted: {len(summary['files_deleted'])} files")
+        if summary['modified_count']:
+            parts.append(f"Modified: {summary['modified_count']} files")
+        if summary['created_count']:
+            parts.append(f"Created: {summary['created_count']} files")
+        if summary['deleted_count']:
+            parts.append(f"Deleted: {summary['deleted_count']} files")
 
         return "Claude Code session completed. " + "; ".join(parts)
 
@@ -154,7 +182,8 @@ class CompletionNotifier:
         results = []
 
         # Use new audio notification system if available
-        if AUDIO_NOTIFY_AVAILABLE:
+        AudioNotifier = import_audio_notifier()
+        if AudioNotifier is not None:
             # Check if audio is enabled (completion config)
             completion_config = notif_config.get('completion', {})
             audio_enabled = completion_config.get('enabled', True)
@@ -193,9 +222,11 @@ class CompletionNotifier:
             # Fallback to legacy TTS if audio-notify not available
             if notif_config.get('tts', False):
                 try:
-                    import subprocess
-                    subprocess.run(['say', message.split('.')[0]], capture_output=True, timeout=30)
-                    results.append("✓ TTS completed (legacy)")
+                    # Fire and forget; the hook doesn't wait for speech to end
+                    subprocess.Popen(['say', message.split('.')[0]],
+                                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL, start_new_session=True)
+                    results.append("✓ TTS started (legacy)")
                 except Exception:
                     results.append("⚠ TTS failed")
 
@@ -205,17 +236,15 @@ class CompletionNotifier:
 def main():
     """Main hook execution."""
     try:
-        # Read stdin for hook event data
-        stdin_data = None
+        # Drain the hook event data from stdin; nothing here uses it, so
+        # read the raw bytes without decoding or parsing them
         try:
-            stdin_text = sys.stdin.read()
-            if stdin_text:
-                stdin_data = json.loads(stdin_text)
+            sys.stdin.buffer.read()
         except Exception:
             pass
 
         # Log to file for debugging
-        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+        project_dir = Path(os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd())
 
         config = load_config(project_dir)
         notifier = CompletionNotifier(project_dir, config)
@@ -5,9 +5,10 @@ Validates dev-plugin environment without making changes.
 Triggered by: claude --maintenance
 """
 
+import hashlib
+import importlib.util
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
 from typing import List, Tuple
@@ -36,7 +37,7 @@ def check_config_files(claude_dir: Path) -> Tuple[bool, List[str]]:
         try:
             import yaml
             with open(config_path) as f:
-                yaml.safe_load(f)
+                yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
         except ImportError:
             issues.append("Warning: PyYAML not installed, cannot validate config")
         except Exception as e:
@@ -54,21 +55,34 @@ def check_dependencies() -> Tuple[bool, List[str]]:
     """Check if required dependencies are installed."""
     issues = []
 
-    # Check PyYAML
+    # Check PyYAML (find_spec locates the module without importing it or
+    # spawning pip)
     try:
-        result = subprocess.run(
-            [sys.executable, '-m', 'pip', 'show', 'pyyaml'],
-            capture_output=True,
-            timeout=10
-        )
-        if result.returncode != 0:
+        if importlib.util.find_spec('yaml') is None:
             issues.append("Missing: pyyaml (run 'claude --init')")
-    except Exception as e:
+    except (ImportError, ValueError) as e:
         issues.append(f"Error checking pyyaml: {e}")
 
     return len(issues) == 0, issues
 
 
+def get_deps_sentinel() -> Path:
+    """
+    Sentinel file marking a successful dependency check.
+
+    Keyed by the plugin manifest contents and the Python interpreter, so a
+    plugin update or a different environment triggers a fresh check.
+    """
+    plugin_root = Path(os.environ.get('CLAUDE_PLUGIN_ROOT') or Path(__file__).parent.parent.parent)
+    key = hashlib.blake2b(digest_size=8)
+    try:
+        key.update((plugin_root / '.claude-plugin' / 'plugin.json').read_bytes())
+    except OSError:
+        key.update(str(plugin_root).encode())
+    key.update(sys.executable.encode())
+    return Path.home() / '.claude' / f'.devplugin-deps-ok-{key.hexdigest()}'
+
+
 def main() -> int:
     """Main validation logic."""
     try:
@@ -91,9 +105,17 @@ def main() -> int:
         config_ok, config_issues = check_config_files(claude_dir)
         all_issues.extend(config_issues)
 
-        # Check dependencies
-        deps_ok, deps_issues = check_dependencies()
-        all_issues.extend(deps_issues)
+        # Check dependencies (skipped once verified for this plugin version)
+        sentinel = get_deps_sentinel()
+        if not sentinel.exists():
+            deps_ok, deps_issues = check_dependencies()
+            all_issues.extend(deps_issues)
+            if deps_ok:
+                try:
+                    sentinel.parent.mkdir(parents=True, exist_ok=True)
+                    sentinel.touch()
+                except OSError:
+                    pass
 
         # Report results
         if not all_issues:
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Locate the latest Claude Code transcript for dev-plugin hooks.
+
+Claude Code stores transcripts as *.jsonl files in ~/.claude/projects/<project>/.
+Main conversation files have UUID names, agent files have agent-*.jsonl names,
+and the session ID is stored inside each JSON line.
+
+Scanning every project directory on each hook run is wasteful, so the newest
+transcript of each project is kept in an index file together with the
+directory's mtime. A cached entry is reused while the directory's mtime is
+unchanged (no files added or removed), but the cached transcript's own mtime
+is re-read with one stat per project, because appends change the file's
+mtime and not the directory's. A project is rescanned only when its
+directory changed or its cached transcript is gone.
+
+Known staleness: appending to a transcript that is *not* its project's
+cached latest (e.g. resuming an older session) goes unnoticed until that
+project's directory changes. The current project's directory is always
+rescanned to cover that case for the running session; its directory name
+is derived the way Claude Code names project dirs (non-alphanumerics
+replaced by '-'). If that derivation ever stops matching, the current
+project falls back to the same cached-entry checks as every other project.
+
+Index format:
+    {project_name: {"dir_mtime": ns, "latest": path or None, "mtime": float}}
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+
+from json_codec import json_dumps, json_loads
+
+# Where Claude Code keeps one directory of transcripts per project
+PROJECTS_DIR = Path.home() / '.claude' / 'projects'
+
+# Directory holding each hook's index file (hooks pass their own file name)
+INDEX_DIR = Path.home() / '.claude' / 'plugins' / 'dev-plugin'
+
+
+def load_transcript_index(index_path: Path) -> dict:
+    """Load a transcript index (empty dict if missing or unreadable)."""
+    try:
+        index = json_loads(index_path.read_bytes())
+        return index if isinstance(index, dict) else {}
+    except (ValueError, OSError):
+        return {}
+
+
+def save_transcript_index(index_path: Path, index: dict) -> None:
+    """Atomically write a transcript index."""
+    tmp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}.tmp')
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(json_dumps(index))
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass  # Index is best-effort
+
+
+def scan_project_transcripts(project_dir: str, include_agents: bool = False) -> Tuple[Optional[str], float]:
+    """Return (path, mtime) of the newest transcript in a project dir."""
+    latest_path = None
+    latest_mtime = 0
+
+    # DirEntry caches its stat result, so each file costs at most one stat
+    with os.scandir(project_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith('.jsonl'):
+                continue
+            if not include_agents and name.startswith('agent-'):
+                continue
+
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if mtime > latest_mtime:
+                latest_mtime = mtime
+                latest_path = entry.path
+
+    return (latest_path, latest_mtime)
+
+
+def cached_latest(entry: dict) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Revalidate a cached index entry whose directory is unchanged.
+
+    Returns:
+        Tuple of (path, current mtime), or (None, None) if a rescan is needed
+    """
+    path = entry.get('latest')
+    if not path:
+        return (None, 0)  # No transcripts, and none added since
+    try:
+        # Appends change the file's mtime, not the directory's
+        return (path, os.stat(path).st_mtime)
+    except OSError:
+        return (None, None)
+
+
+def find_latest_transcript(
+    index_path: Path,
+    current_project: Optional[Path] = None,
+    include_agents: bool = False,
+) -> Optional[Tuple[str, Path]]:
+    """
+    Find the most recently modified transcript file.
+
+    Args:
+        index_path: Index file of the calling hook
+        current_project: Project of the running session, always rescanned
+        include_agents: Also consider agent-*.jsonl transcripts
+
+    Returns:
+        Tuple of (session_id, transcript_path), or None if none was found
+    """
+    # Claude Code names project dirs after the path with non-alphanumerics as '-'
+    current_name = re.sub(r'[^A-Za-z0-9]', '-', str(current_project)) if current_project else None
+
+    index = load_transcript_index(index_path)
+    new_index = {}
+    latest_path = None
+    latest_mtime = 0
+
+    try:
+        project_entries = list(os.scandir(PROJECTS_DIR))
+    except OSError:
+        return None
+
+    for project_entry in project_entries:
+        # d_type from readdir: no stat needed to skip plain files
+        if not project_entry.is_dir(follow_symlinks=False):
+            continue
+
+        name = project_entry.name
+        try:
+            dir_mtime = project_entry.stat().st_mtime_ns
+            entry = index.get(name)
+            path = mtime = None
+            if entry and entry.get('dir_mtime') == dir_mtime and name != current_name:
+                path, mtime = cached_latest(entry)
+            if mtime is None:
+                path, mtime = scan_project_transcripts(project_entry.path, include_agents)
+        except OSError:
+            continue  # Directory vanished mid-scan
+
+        new_index[name] = {'dir_mtime': dir_mtime, 'latest': path, 'mtime': mtime}
+        if path and mtime > latest_mtime:
+            latest_mtime = mtime
+            latest_path = path
+
+    if new_index != index:
+        save_transcript_index(index_path, new_index)
+
+    if not latest_path:
+        return None
+
+    # Extract session ID from the first line (read just that line, not the
+    # whole transcript)
+    latest_file = Path(latest_path)
+    try:
+        with open(latest_file, 'rb') as f:
+            first_msg = json_loads(f.readline())
+        return (first_msg.get('sessionId', latest_file.stem), latest_file)
+    except (ValueError, OSError):  # json/orjson decode errors
+        return None
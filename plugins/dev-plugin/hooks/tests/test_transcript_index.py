@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for transcript_index.find_latest_transcript.
+
+Run from the repository root:
+    python -m unittest discover plugins/dev-plugin/hooks/tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import transcript_index  # noqa: E402
+
+
+def write_transcript(path: Path, session_id: str, mtime: float) -> None:
+    """Create a one-line transcript with a fixed mtime."""
+    path.write_text(f'{{"sessionId": "{session_id}"}}\n')
+    os.utime(path, (mtime, mtime))
+
+
+class FindLatestTranscriptTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.projects = root / 'projects'
+        self.index_path = root / 'index.json'
+        patcher = mock.patch.object(transcript_index, 'PROJECTS_DIR', self.projects)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Two other projects (neither is the current one), directory mtimes fixed
+        self.a = self.projects / 'a' / 'session-a.jsonl'
+        self.b = self.projects / 'b' / 'session-b.jsonl'
+        for path in (self.a, self.b):
+            path.parent.mkdir(parents=True)
+        write_transcript(self.a, 'A', 1000)
+        write_transcript(self.b, 'B', 2000)
+        for project in ('a', 'b'):
+            os.utime(self.projects / project, (500, 500))
+
+    def find(self):
+        return transcript_index.find_latest_transcript(self.index_path)
+
+    def test_finds_newest_transcript(self):
+        self.assertEqual(self.find(), ('B', self.b))
+
+    def test_append_to_cached_transcript_is_seen(self):
+        self.assertEqual(self.find(), ('B', self.b))
+
+        # Appending changes the file's mtime but not its directory's
+        dir_mtime = os.stat(self.a.parent).st_mtime_ns
+        with open(self.a, 'a') as f:
+            f.write('{"type": "user"}\n')
+        os.utime(self.a, (3000, 3000))
+        self.assertEqual(os.stat(self.a.parent).st_mtime_ns, dir_mtime)
+
+        self.assertEqual(self.find(), ('A', self.a))
+
+    def test_new_transcript_in_project_is_seen(self):
+        self.assertEqual(self.find(), ('B', self.b))
+
+        c = self.a.parent / 'session-c.jsonl'
+        write_transcript(c, 'C', 4000)
+        self.assertEqual(self.find(), ('C', c))
+
+    def test_deleted_cached_transcript_triggers_rescan(self):
+        self.assertEqual(self.find(), ('B', self.b))
+
+        self.b.unlink()
+        os.utime(self.b.parent, (500, 500))  # Keep the cached dir mtime
+        self.assertEqual(self.find(), ('A', self.a))
+
+
+if __name__ == '__main__':
+    unittest.main()